@@ -0,0 +1,151 @@
+# --- 데이터 엔진 ---
+# 구글 시트 연결과 세션 공통 객체(동기화 사본, 쓰기, 백그라운드 갱신, 저널, 사업장 파티션 ...)를 st.cache_resource 로 보관한다.
+# main.py 화면 코드와 bench.py 가 같은 함수를 쓰므로, 벤치마크는 get_engine() 만 가짜 클라이언트로 바꿔서 실제 캐시 경로를 잰다.
+import streamlit as st
+import pandas as pd
+import gspread
+from google.oauth2.service_account import Credentials
+
+from sheet_sync import SheetSync
+from sheet_writer import SheetWriter
+from tenant_cache import TenantCache
+from refresher import SheetRefresher
+from journal import PunchJournal
+from archive import AttendanceHistory, ArchiveJob
+from users import build_user_directory
+from approvals import ApprovalEngine
+from metrics import METRICS, instrument
+
+SPREADSHEET_ID = "15IPQ_1T5e2aGlyTuDmY_VYBZsT6bui4LYZ5bLmuyKxU"
+
+@st.cache_resource
+def get_engine():
+    try:
+        if "gcp_service_account" not in st.secrets:
+            st.error("🚨 Secrets 설정이 비어있습니다.")
+            return None
+
+        scope = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
+        creds_info = dict(st.secrets["gcp_service_account"])
+        
+        if "private_key" in creds_info:
+            creds_info["private_key"] = creds_info["private_key"].replace("\\n", "\n")
+            
+        credentials = Credentials.from_service_account_info(creds_info, scopes=scope)
+        client = instrument(gspread.authorize(credentials))  # 모든 API 호출 계측
+        client.open_by_key(SPREADSHEET_ID) # 연결 테스트
+        return client
+
+    except Exception as e:
+        st.error(f"🚨 구글 연결 오류:\n{e}")
+        return None
+
+@st.cache_resource
+def get_sync():
+    engine = get_engine()
+    return SheetSync(engine, SPREADSHEET_ID) if engine is not None else None
+
+@st.cache_resource
+def get_writer():
+    # 모든 시트 쓰기는 이 객체를 통해 일괄 처리 (핸들 캐시 + 429 재시도)
+    sync = get_sync()
+    return SheetWriter(sync) if sync is not None else None
+
+@st.cache_resource
+def get_refresher():
+    # 세션 공통 백그라운드 갱신기: 화면은 마지막 사본을 바로 쓰고 API 확인은 작업 스레드에서
+    sync = get_sync()
+    return SheetRefresher(sync) if sync is not None else None
+
+@st.cache_resource
+def get_approvals():
+    writer = get_writer()
+    return ApprovalEngine(writer) if writer is not None else None
+
+@st.cache_resource
+def get_journal():
+    # 출근/퇴근은 로컬 저널에 먼저 저장하고 백그라운드에서 시트로 모아서 전송
+    writer = get_writer()
+    if writer is None: return None
+    try:
+        return PunchJournal(writer)
+    except Exception as e:
+        return None
+
+def record_punch(row):
+    journal = get_journal()
+    if journal is not None: journal.record(row)
+    else: get_writer().append_row("Attendance_Records", row)
+
+@st.cache_resource
+def get_tenants():
+    sync = get_sync()
+    return TenantCache(sync, refresher=get_refresher()) if sync is not None else None
+
+@st.cache_resource(max_entries=2)
+def _user_directory(rev, _df):
+    METRICS.cache_call("user_directory", miss=True)
+    return build_user_directory(_df)
+
+def user_directory():
+    # User_List 리비전이 바뀐 경우에만 디렉터리를 다시 만든다 (로그인/결재자 목록은 사전 조회)
+    METRICS.cache_call("user_directory")
+    refresher = get_refresher()
+    if refresher is None: return build_user_directory(pd.DataFrame())
+    try:
+        refresher.frame("User_List")
+        rev, df = refresher.sync.snapshot("User_List")
+    except Exception:
+        return build_user_directory(pd.DataFrame())
+    return _user_directory(rev, df)
+
+@st.cache_resource
+def get_history():
+    # 나의 기록 확인/데이터 추출용: 현재 시트 + 월별 보관 시트
+    sync, tc = get_sync(), get_tenants()
+    return AttendanceHistory(sync, tc) if sync is not None else None
+
+@st.cache_resource
+def get_archive_job():
+    # secrets 의 auto_archive = true 일 때만 매일 새벽 마감된 달을 보관 시트로 옮긴다
+    sync = get_sync()
+    try:
+        enabled = bool(st.secrets.get("auto_archive", False))
+    except Exception:
+        enabled = False
+    return ArchiveJob(sync, get_history()) if sync is not None and enabled else None
+
+def history_frame(biz, start=None, end=None, hot=None):
+    # 기간에 걸친 보관 월을 합친 근태 기록 (보관 시트를 못 읽으면 현재 시트만)
+    hist = get_history()
+    if hist is None: return hot if hot is not None else pd.DataFrame()
+    try:
+        return hist.frame(biz, start, end, hot=hot)
+    except Exception as e:
+        return hot if hot is not None else pd.DataFrame()
+
+def tenant_frame(sheet_name, biz):
+    # 사업자번호 별 파티션만 반환 (다른 사업장 행은 복사/직렬화하지 않음)
+    tc = get_tenants()
+    if tc is None: return pd.DataFrame()
+    try:
+        return tc.frame(sheet_name, biz)
+    except Exception as e:
+        return pd.DataFrame()
+
+@st.cache_resource(max_entries=64)
+def _tenant_index(sheet, biz, rev, _build, _df):
+    METRICS.cache_call("tenant_index", miss=True)
+    return _build(_df)
+
+def tenant_index(sheet, biz, build):
+    # 해당 사업장 파티션이 바뀐 경우(리비전 변경)에만 파생 인덱스를 다시 만든다
+    METRICS.cache_call("tenant_index")
+    tc = get_tenants()
+    if tc is None: return build(pd.DataFrame())
+    try:
+        tc.ensure(sheet)
+        rev, df = tc.partition(sheet, biz)
+    except Exception:
+        return build(pd.DataFrame())
+    return _tenant_index(sheet, str(biz), rev, build, df)
@@ -0,0 +1,116 @@
+# --- 전자결재 엔진 ---
+# 결재 상태는 대기 -> 1차 승인 -> 승인 순서로만 바뀐다 (결재자가 1명이면 대기 -> 승인).
+#  - ApprovalIndex : 결재데이터가 바뀔 때 한 번만 만들어서, 결재자 -> 지금 내 차례인 문서 / 아이디 -> 관련 문서를 사전 조회
+#  - ApprovalEngine : 승인 직전에 시트의 실제 행을 다시 읽어 결재ID/상태(행 버전)를 확인하고,
+#    상태·결재일을 한 번의 일괄 쓰기로 반영한다. 그 사이 다른 곳에서 처리됐으면 ApprovalConflict.
+#    최종 승인 시 함께 추가할 행(연차 일정)은 승인이 반영된 뒤 따로 추가하고, 실패하면 승인은 유지한 채 호출한 쪽에 알린다.
+import threading
+
+from schema import split_ids
+from sheet_sync import col_letter
+
+SHEET = "결재데이터"
+COLUMNS = ["결재ID", "사업자번호", "기안자ID", "이름", "결재유형", "제목", "내용", "상태", "기안일", "결재일", "결재자ID"]
+ID_COL, STATE_COL, DATE_COL = 1, 8, 10   # 시트 열 번호 (1부터)
+WAITING, FIRST, DONE = "대기", "1차 승인", "승인"
+HISTORY_PAGE = 20   # 결재함 전체 내역 한 페이지 문서 수
+
+
+class ApprovalConflict(Exception):
+    pass
+
+
+def approvers_of(v):
+    return v if isinstance(v, tuple) else split_ids(v)
+
+
+def current_approver(approvers, state):
+    # 지금 승인할 차례인 결재자 (없으면 None)
+    if state == WAITING and approvers: return approvers[0]
+    if state == FIRST and len(approvers) > 1: return approvers[1]
+    return None
+
+
+def next_state(approvers, state, uid):
+    # uid 가 승인했을 때의 다음 상태 (uid 차례가 아니면 None)
+    if current_approver(approvers, state) != str(uid): return None
+    return FIRST if state == WAITING and len(approvers) > 1 else DONE
+
+
+class ApprovalIndex:
+    def __init__(self, frame):
+        self.frame = frame
+        self._pending = {}   # 결재자ID -> [행 위치] (지금 그 사람이 승인할 차례)
+        self._related = {}   # 아이디 -> [행 위치] (기안했거나 결재선에 있는 문서, 시트 순서)
+
+    def pending(self, uid):
+        return self.frame.iloc[self._pending.get(str(uid), [])]
+
+    def count(self, uid):
+        return len(self._related.get(str(uid), []))
+
+    def related(self, uid, start=0, n=HISTORY_PAGE):
+        # 최근 문서부터 start 번째부터 n 건
+        pos = self._related.get(str(uid), [])[::-1][start:start + n]
+        return self.frame.iloc[pos]
+
+
+def build_approval_index(df):
+    idx = ApprovalIndex(df)
+    if df.empty or not {'결재ID', '기안자ID', '상태', '결재자ID'} <= set(df.columns): return idx
+    drafters = df['기안자ID'].astype(str).to_numpy()
+    states = df['상태'].astype(str).to_numpy()
+    for pos, (drafter, state, aps) in enumerate(zip(drafters, states, df['결재자ID'])):
+        aps = approvers_of(aps)
+        turn = current_approver(aps, state)
+        if turn: idx._pending.setdefault(turn, []).append(pos)
+        for who in dict.fromkeys((drafter,) + aps): idx._related.setdefault(who, []).append(pos)
+    return idx
+
+
+class ApprovalEngine:
+    def __init__(self, writer):
+        self.writer = writer
+        self._lock = threading.Lock()   # 같은 서버 안의 동시 승인은 순서대로
+
+    def submit(self, row):
+        self.writer.append_row(SHEET, row)
+
+    def approve(self, doc, uid, when, extra_rows=()):
+        # doc: 화면에 보이던 결재 행 (row.name = 사본 기준 위치). extra_rows: 최종 승인 시 함께 추가할 (시트, 행)
+        # -> (다음 상태, [(시트, 예외)] 추가하지 못한 행)
+        doc_id, seen = str(doc['결재ID']), str(doc['상태'])
+        nxt = next_state(approvers_of(doc['결재자ID']), seen, uid)
+        if nxt is None: raise ApprovalConflict("지금 승인할 차례가 아닙니다.")
+        with self._lock:
+            row, live = self._locate(doc_id, int(doc.name) + 2)
+            if live[STATE_COL - 1] != seen:
+                raise ApprovalConflict(f"다른 곳에서 먼저 처리된 결재입니다. (현재 상태: {live[STATE_COL - 1] or '알 수 없음'})")
+            # 시트 행을 결재ID 로 다시 찾았으면 사본의 같은 번호 행은 다른 문서 -> 결재ID 확인 키로 사본 반영을 막는다
+            key = (ID_COL, doc_id)
+            with self.writer.batch() as wb:
+                wb.update_cell(SHEET, row, STATE_COL, nxt, key)
+                wb.update_cell(SHEET, row, DATE_COL, when, key)
+        # 일정 시트가 없거나 추가가 실패해도 이미 반영된 승인은 되돌리지 않는다
+        failed = []
+        if nxt == DONE:
+            for sheet, values in extra_rows:
+                try:
+                    self.writer.append_row(sheet, values)
+                except Exception as e:
+                    failed.append((sheet, e))
+        return nxt, failed
+
+    def _locate(self, doc_id, row):
+        # 사본 기준 행 번호를 먼저 확인하고, 행이 밀렸으면 결재ID 로 다시 찾는다 -> (시트 행 번호, 행 값)
+        ws = self.writer.sync.worksheet(SHEET)
+        live = self._row(ws, row)
+        if live[ID_COL - 1] != doc_id:
+            cell = ws.find(doc_id, in_column=ID_COL)
+            if cell is None: raise ApprovalConflict("결재 문서를 시트에서 찾을 수 없습니다.")
+            row, live = cell.row, self._row(ws, cell.row)
+        return row, live
+
+    def _row(self, ws, row):
+        vals = ws.get_values(f"A{row}:{col_letter(len(COLUMNS))}{row}")
+        return ([str(v) for v in vals[0]] if vals else []) + [""] * len(COLUMNS)
@@ -0,0 +1,195 @@
+# --- 근태 기록 월별 보관 ---
+# Attendance_Records 에는 이번 달과 지난달(HOT_MONTHS)만 남기고, 마감된 달의 행은
+# 월별 보관 시트(Attendance_Records_2026-08 ...)로 옮긴다. 화면의 실시간 경로(사이드바/대시보드/근무 관리)는
+# 현재 시트만 읽으므로 기록이 쌓여도 속도가 일정하게 유지된다.
+#  - compact()            : 보관 시트에 먼저 추가한 뒤 원본에서 한 번의 batch_update 로 삭제 (중간에 멈춰도 다시 실행하면 이어서 처리)
+#  - AttendanceHistory    : 나의 기록 확인/데이터 추출처럼 과거가 필요한 화면에서 현재 시트 + 기간에 걸친 보관 시트를 합쳐 읽는다
+#                           (최근에 읽은 MAX_ARCHIVES 개 달의 사본만 메모리에 남긴다)
+#  - ArchiveJob           : 매일 ARCHIVE_HOUR(KST) 에 한 번 compact() 실행 (secrets 의 auto_archive = true 일 때만)
+import logging
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from gspread.exceptions import WorksheetNotFound
+
+from schema import times
+from sheet_sync import col_letter
+from sheet_writer import with_backoff
+
+SHEET = "Attendance_Records"
+ARCHIVE_PREFIX = SHEET + "_"
+HOT_MONTHS = 2           # 현재 시트에 남기는 달 수 (이번 달 포함)
+ARCHIVE_MAX_AGE = 3600   # 보관 시트는 다시 쓰이지 않으므로 사본을 오래 쓴다 (초)
+LIST_MAX_AGE = 300       # 보관 시트 목록 확인 주기 (초)
+ARCHIVE_HOUR = 4         # 자동 보관 실행 시각 (KST, 쓰기가 거의 없는 시간)
+CHECK_SEC = 600
+MAX_ARCHIVES = 6         # 메모리에 남길 보관 시트 사본 수 (최근에 읽은 순)
+
+_ARCHIVE_TITLE = re.compile(r"^" + re.escape(ARCHIVE_PREFIX) + r"(\d{4})-(\d{2})$")
+
+log = logging.getLogger("didimdol.archive")
+
+
+def archive_title(year, month):
+    return f"{ARCHIVE_PREFIX}{year}-{month:02d}"
+
+
+def archive_month(title):
+    # 보관 시트 이름 -> (연, 월), 보관 시트가 아니면 None
+    m = _ARCHIVE_TITLE.match(title)
+    return (int(m.group(1)), int(m.group(2))) if m else None
+
+
+def hot_start(today):
+    # 현재 시트에 남는 첫 날 (지난달 1일)
+    y, m = today.year, today.month - (HOT_MONTHS - 1)
+    while m < 1: y, m = y - 1, m + 12
+    return date(y, m, 1)
+
+
+def compact(sync, today):
+    # 마감된 달의 행을 보관 시트로 옮긴다 -> {보관 시트명: 옮긴 행 수}
+    # 일시를 알 수 없는 행은 어느 달인지 모르므로 현재 시트에 그대로 둔다
+    ws = sync.worksheet(SHEET)
+    data = with_backoff(ws.get_all_values)
+    if len(data) < 2: return {}
+    header, rows = data[0], data[1:]
+    width = len(header)
+    if '일시' not in header: return {}
+    col = header.index('일시')
+    ts = times(pd.Series([r[col] if len(r) > col else "" for r in rows], dtype=object))
+    old = (ts < pd.Timestamp(hot_start(today))).to_numpy()
+    if not old.any(): return {}
+
+    moved = {}
+    pos = np.flatnonzero(old)
+    for (y, m), p in pd.Series(pos).groupby([ts.iloc[pos].dt.year.to_numpy(), ts.iloc[pos].dt.month.to_numpy()]):
+        title = archive_title(int(y), int(m))
+        part = [(rows[i] + [""] * width)[:width] for i in p]
+        _archive(sync, title, header, part)
+        moved[title] = len(part)
+
+    # 읽은 뒤 누가 시트 중간을 편집/삭제했으면 행 번호가 어긋나므로 삭제하지 않는다 (보관 시트는 다음 실행 때 중복 없이 이어짐)
+    now = with_backoff(ws.get_values, f"A1:{col_letter(width)}{len(data)}")
+    if [(r + [""] * width)[:width] for r in now] != [(r + [""] * width)[:width] for r in data]:
+        raise RuntimeError("보관 중 근태 기록 시트가 바뀌어 삭제를 건너뜁니다. 다음 실행 때 다시 시도합니다.")
+    # 연속된 행 묶음마다 deleteDimension 하나, 아래쪽부터 지워야 앞 범위의 행 번호가 유지된다
+    requests = [{"deleteDimension": {"range": {"sheetId": ws.id, "dimension": "ROWS", "startIndex": s + 1, "endIndex": e + 1}}}
+                for s, e in reversed(_runs(pos))]
+    with_backoff(sync.spreadsheet().batch_update, {"requests": requests})
+    sync.invalidate(SHEET)
+    log.info("근태 기록 보관: %s", moved)
+    return moved
+
+
+def _archive(sync, title, header, rows):
+    # 보관 시트에 없는 행만 추가 (이전 실행이 추가 후 삭제 전에 멈췄으면 이미 들어 있다). 같은 행이 여러 번 있을 수 있어 개수로 비교
+    sh = sync.spreadsheet()
+    try:
+        ws = sh.worksheet(title)
+        have = Counter(tuple((r + [""] * len(header))[:len(header)]) for r in with_backoff(ws.get_all_values)[1:])
+        new = []
+        for r in rows:
+            if have[tuple(r)]: have[tuple(r)] -= 1
+            else: new.append(r)
+    except WorksheetNotFound:
+        ws = with_backoff(sh.add_worksheet, title=title, rows=len(rows) + 1, cols=len(header))
+        new = [header] + rows
+    if new: with_backoff(ws.append_rows, new)
+
+
+def _runs(pos):
+    # 정렬된 위치 -> [(시작, 끝)] 연속 구간 (끝 제외)
+    breaks = np.flatnonzero(np.diff(pos) != 1) + 1
+    return [(int(p[0]), int(p[-1]) + 1) for p in np.split(pos, breaks)]
+
+
+class AttendanceHistory:
+    def __init__(self, sync, tenants, max_archives=MAX_ARCHIVES):
+        self.sync = sync
+        self.tenants = tenants
+        self.max_archives = max_archives
+        self._months = []
+        self._listed_at = 0.0
+        self._loaded = OrderedDict()   # 사본을 올려 둔 보관 시트명 (LRU)
+        self._lock = threading.Lock()
+
+    def months(self, start=None, end=None):
+        # start ~ end 에 걸친 보관 월 [(연, 월)]
+        with self._lock:
+            if time.time() - self._listed_at > LIST_MAX_AGE:
+                titles = [ws.title for ws in self.sync.spreadsheet().worksheets()]
+                self._months = sorted(ym for ym in map(archive_month, titles) if ym)
+                self._listed_at = time.time()
+            months = self._months
+        lo = (start.year, start.month) if start else (0, 0)
+        hi = (end.year, end.month) if end else (9999, 12)
+        return [ym for ym in months if lo <= ym <= hi]
+
+    def expire(self):
+        with self._lock: self._listed_at = 0.0
+
+    def frame(self, biz, start=None, end=None, hot=None):
+        # 보관 월(오래된 순) + 현재 시트의 사업장 행. 걸치는 보관 월이 없으면 hot 을 그대로 반환
+        if hot is None: hot = self.tenants.frame(SHEET, biz)
+        parts = []
+        for y, m in self.months(start, end):
+            title = archive_title(y, m)
+            self._touch(title)
+            self.sync.frame(title, max_age=ARCHIVE_MAX_AGE)
+            part = self.tenants.partition(title, biz)[1]
+            if not part.empty: parts.append(part)
+        if not parts: return hot
+        if not hot.empty: parts.append(hot)
+        return pd.concat(parts, ignore_index=True)
+
+    def loaded(self):
+        with self._lock: return list(self._loaded)
+
+    def _touch(self, title):
+        # 오래 안 쓴 보관 시트는 사본/파티션을 내린다 (한 번 훑어본 과거 달이 계속 메모리에 남지 않도록)
+        with self._lock:
+            self._loaded[title] = None
+            self._loaded.move_to_end(title)
+            evict = []
+            while len(self._loaded) > self.max_archives: evict.append(self._loaded.popitem(last=False)[0])
+        for t in evict:
+            self.tenants.forget(t)
+            self.sync.forget(t)
+
+
+class ArchiveJob:
+    def __init__(self, sync, history=None, hour=ARCHIVE_HOUR, interval=CHECK_SEC):
+        self.sync = sync
+        self.history = history
+        self.hour = hour
+        self.interval = interval
+        self.last_day = None
+        self.last_result = None   # 마지막 실행 결과 (dict 또는 예외)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="attendance-archive", daemon=True)
+        self._thread.start()
+
+    def run(self, today):
+        try:
+            self.last_result = compact(self.sync, today)
+        except Exception as e:
+            log.warning("근태 기록 보관 실패: %s", e)
+            self.last_result = e
+        if self.history is not None: self.history.expire()
+        return self.last_result
+
+    def close(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            now = datetime.now() + timedelta(hours=9)
+            if now.hour == self.hour and self.last_day != now.date():
+                self.last_day = now.date()
+                self.run(now.date())
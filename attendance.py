@@ -0,0 +1,95 @@
+# --- 근태 인덱스 ---
+# Attendance_Records 를 데이터가 바뀔 때 한 번만 훑어서 (사업자번호, 아이디, 날짜) 별
+# 출근/퇴근 시각과 첫 출근(수정) 행 위치를 미리 계산해 둔다.
+# 화면에서는 매번 str.contains 로 전체를 스캔하지 않고 사전 조회만 한다.
+# 일시는 schema 에서 datetime64 로, 사업자번호/아이디/구분은 category 로 들어온다.
+# 일시를 읽을 수 없는 기록도 앞의 날짜로 그 날에 묶어서, 근무 관리 표에서 '오류' 로 보이고 수정 폼에 원문 시각이 채워지게 한다.
+import pandas as pd
+
+from schema import times, contains, days_of, unreadable
+
+KEYS = ["b", "u", "d"]
+DAY_COLUMNS = ["in_at", "out_at", "in_bad", "out_bad"]   # in_bad/out_bad: 그 날 시각을 읽을 수 없는 출근/퇴근 기록이 있음
+
+
+class DayRecord:
+    __slots__ = ("in_at", "out_at", "in_text", "out_text", "fix_in_row")
+
+    def __init__(self):
+        self.in_at = None       # 출근 일시 Timestamp (수정 기록이 있으면 마지막 수정값, 없으면 첫 출근)
+        self.out_at = None      # 퇴근 일시 Timestamp (수정 기록이 있으면 마지막 수정값, 없으면 마지막 퇴근)
+        self.in_text = None     # 시각을 읽을 수 없는 마지막 출근 기록의 원문 시각 부분
+        self.out_text = None    # 시각을 읽을 수 없는 마지막 퇴근 기록의 원문 시각 부분
+        self.fix_in_row = None  # 첫 '출근(수정)' 행 번호 (원본 index, 시트 행 = +2)
+
+
+_EMPTY = DayRecord()
+
+
+class AttendanceIndex:
+    def __init__(self, frame):
+        self.frame = frame
+        self.days = pd.DataFrame(columns=KEYS + DAY_COLUMNS)  # 하루 1행 (월간 계산용)
+        self._days = {}    # (사업자번호, 날짜) -> {아이디: DayRecord}
+        self._users = {}   # (사업자번호, 아이디) -> 행 위치 배열
+
+    def get(self, biz, uid, day):
+        return self._days.get((str(biz), day), {}).get(str(uid), _EMPTY)
+
+    def user_frame(self, biz, uid):
+        pos = self._users.get((str(biz), str(uid)))
+        return self.frame.iloc[pos] if pos is not None else self.frame.iloc[0:0]
+
+
+def build_attendance_index(recs):
+    idx = AttendanceIndex(recs)
+    if recs.empty or not {'사업자번호', '아이디', '일시', '구분'} <= set(recs.columns): return idx
+
+    ts = times(recs['일시'])
+    bad = unreadable(recs['일시'], ts).to_numpy()
+    kind = recs['구분']
+    # 날짜 문자열은 서로 다른 날짜 수만큼만 만든다 (행마다 strftime 하지 않음)
+    codes, days = pd.factorize(days_of(recs['일시'], ts) if bad.any() else ts.dt.normalize())
+    f = pd.DataFrame({
+        "b": recs['사업자번호'].astype("category").to_numpy(),
+        "u": recs['아이디'].astype("category").to_numpy(),
+        "d": pd.Categorical.from_codes(codes, days.strftime("%Y-%m-%d")),
+        "t": ts.to_numpy(),
+        "row": recs.index.to_numpy(),
+    })
+    is_in = contains(kind, '출근').to_numpy()
+    is_out = contains(kind, '퇴근').to_numpy()
+    fixed = contains(kind, '수정').to_numpy()
+
+    def pick(mask, col, how):
+        return getattr(f[mask].groupby(KEYS, sort=False, observed=True)[col], how)()
+
+    in_at = pick(is_in & fixed, "t", "last").combine_first(pick(is_in & ~fixed, "t", "first"))
+    out_at = pick(is_out & fixed, "t", "last").combine_first(pick(is_out & ~fixed, "t", "last"))
+    fix_in = pick((kind == '출근(수정)').to_numpy(), "row", "first")
+    in_bad = out_bad = pd.Series(dtype=object)
+    if bad.any():
+        # 시각 부분(날짜 뒤)만 남겨서 수정 폼 기본값으로 쓴다
+        fb = f[bad].assign(text=recs['일시'][bad].astype(str).str.strip().str.split(" ", n=1).str[-1].to_numpy())
+        in_bad = fb[is_in[bad]].groupby(KEYS, sort=False, observed=True)["text"].last()
+        out_bad = fb[is_out[bad]].groupby(KEYS, sort=False, observed=True)["text"].last()
+
+    def slot(key):
+        b, u, d = key
+        return idx._days.setdefault((b, d), {}).setdefault(u, DayRecord())
+
+    in_at, out_at = in_at.dropna(), out_at.dropna()
+    for key, v in in_at.items(): slot(key).in_at = v
+    for key, v in out_at.items(): slot(key).out_at = v
+    for key, v in fix_in.items(): slot(key).fix_in_row = int(v)
+    for key, v in in_bad.items(): slot(key).in_text = v
+    for key, v in out_bad.items(): slot(key).out_text = v
+
+    days = pd.concat({"in_at": in_at, "out_at": out_at,
+                      "in_bad": pd.Series(True, index=in_bad.index), "out_bad": pd.Series(True, index=out_bad.index)}, axis=1)
+    if not days.empty:
+        days.index.names = KEYS
+        days[["in_bad", "out_bad"]] = days[["in_bad", "out_bad"]].fillna(False).astype(bool)
+        idx.days = days.reset_index()
+    idx._users = f.groupby(["b", "u"], sort=False, observed=True).indices
+    return idx
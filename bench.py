@@ -0,0 +1,299 @@
+# --- 오프라인 벤치마크 ---
+# 실제 스프레드시트 대신 가짜 gspread 백엔드(fake_sheets)에 합성 다사업장 데이터를 채워 넣고
+# main.py 의 주요 경로(로그인, 사이드바 오늘 현황, 근무 관리 월간표, 결재함, 데이터 추출, 출근 쓰기)를 잰다.
+# 기본 측정은 main.py 와 같은 app_data 함수를 get_engine() 만 바꿔서 부르고, --app 은 화면 렌더링까지 포함한다.
+# 같은 seed/규모면 같은 데이터가 만들어지므로 결과를 저장해 두고 회귀를 비교할 수 있다.
+#
+#   python bench.py                               # medium 규모
+#   python bench.py --size large --out bench_output.txt
+#   python bench.py --compare bench_output.txt    # 기준보다 느려지거나 API 호출이 늘면 종료코드 1
+#   python bench.py --app                         # main.py 화면 렌더링까지 (streamlit AppTest)
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from fake_sheets import FakeClient
+
+SIZES = {
+    "small": dict(tenants=5, staff=10, days=30),
+    "medium": dict(tenants=20, staff=30, days=90),
+    "large": dict(tenants=50, staff=40, days=250),   # Attendance_Records 약 100만 행
+}
+ANCHOR = date(2026, 3, 31)   # 합성 데이터의 마지막 날 (월간표/오늘 현황 기준일)
+
+USER_HEADER = ["사업자번호", "사업장명", "아이디", "비밀번호", "이름", "권한", "근무시간", "요금제", "고용형태", "주간시간"]
+ATT_HEADER = ["사업자번호", "아이디", "이름", "일시", "구분", "비고", "기타"]
+APP_HEADER = ["결재ID", "사업자번호", "기안자ID", "이름", "결재유형", "제목", "내용", "상태", "기안일", "결재일", "결재자ID"]
+SCH_HEADER = ["사업자번호", "날짜", "이름", "내용"]
+EMP_TYPES = ["정규직", "계약직", "아르바이트"]
+DOC_TYPES = ["연차/휴가 신청서", "지출 결의서", "연장근로 신청서"]
+DOC_STATES = ["대기", "1차 승인", "승인"]
+
+
+def biz_no(t):
+    return f"{1000000000 + t}"
+
+
+def user_id(t, s):
+    return f"t{t}u{s}"
+
+
+# --- 합성 데이터 ---
+def synthetic_sheets(tenants, staff, days, seed=0, anchor=ANCHOR):
+    rnd = random.Random(seed)
+    users, recs, apps, sch = [USER_HEADER], [ATT_HEADER], [APP_HEADER], [SCH_HEADER]
+    people = []
+    for t in range(tenants):
+        for s in range(staff):
+            name = f"직원{t}-{s}"
+            users.append([biz_no(t), f"사업장{t}", user_id(t, s), "pw", name, "Manager" if s < 2 else "Staff",
+                          "8", "스타터", rnd.choice(EMP_TYPES), "40"])
+            people.append((biz_no(t), user_id(t, s), name))
+
+    first = anchor - timedelta(days=days - 1)
+    for n in range(days):
+        d = (first + timedelta(days=n)).isoformat()
+        outs = []
+        for b, uid, name in people:
+            if rnd.random() < 0.05: continue   # 결근
+            start = 9 * 60 + rnd.randint(-30, 30)
+            end = start + 9 * 60 + rnd.randint(-60, 60)
+            recs.append([b, uid, name, f"{d} {start // 60:02d}:{start % 60:02d}:{rnd.randint(0, 59):02d}", "출근", "", ""])
+            if rnd.random() < 0.03: continue   # 퇴근 누락
+            outs.append([b, uid, name, f"{d} {end // 60:02d}:{end % 60:02d}:{rnd.randint(0, 59):02d}", "퇴근", "", ""])
+            if rnd.random() < 0.02:
+                outs.append([b, uid, name, f"{d} 09:00:00", "출근(수정)", "합성 수정", ""])
+                outs.append([b, uid, name, f"{d} 18:00:00", "퇴근(수정)", "합성 수정", ""])
+        recs.extend(outs)
+
+    seq = 0
+    for t in range(tenants):
+        mgrs = [user_id(t, 0), user_id(t, 1)]
+        for _ in range(max(1, staff * days // 20)):
+            s = rnd.randrange(staff)
+            d = (first + timedelta(days=rnd.randrange(days))).isoformat()
+            kind = rnd.choice(DOC_TYPES)
+            seq += 1
+            apps.append([f"APP-{seq:08d}", biz_no(t), user_id(t, s), f"직원{t}-{s}", kind, f"{kind} {seq}",
+                         f"일자:{d} | 사유:합성", rnd.choice(DOC_STATES), f"{d} 10:00:00", "",
+                         ",".join(mgrs if rnd.random() < 0.5 else mgrs[:1])])
+        for _ in range(max(1, days // 3)):
+            s = rnd.randrange(staff)
+            d = first + timedelta(days=rnd.randrange(days))
+            sch.append([biz_no(t), f"{d.year}-{d.month}-{d.day}", f"직원{t}-{s}", "[연차] 합성 일정"])
+
+    # SheetSync.worksheet() 는 인덱스로도 열 수 있으므로 실제 시트 순서를 따른다
+    return {"Attendance_Records": recs, "User_List": users, "결재데이터": apps, "Schedules": sch}
+
+
+# --- 측정 ---
+def _calls(client):
+    return sum(v for (_, kind), v in client.spreadsheet.calls.items() if kind in ("read", "write", "meta"))
+
+
+def _throttled(client):
+    return sum(v for (_, kind), v in client.spreadsheet.calls.items() if kind == "429")
+
+
+def _attempt(fn):
+    # 할당량(--read-quota/--write-quota) 초과로 난 429 는 실패로 세고 계속한다 -> 성공 여부
+    from gspread.exceptions import APIError
+    from sheet_writer import _status
+    try:
+        fn()
+        return True
+    except APIError as e:
+        if _status(e) != 429: raise
+        return False
+
+
+def _measure(client, fn, repeats, foreground=True):
+    # foreground: 측정하는 스레드가 직접 부른 API 호출만 센다 (백그라운드 갱신/플러시 스레드 호출 제외)
+    from metrics import METRICS
+
+    times, calls, failed = [], 0, 0
+    before, throttled = _calls(client), _throttled(client)
+    for _ in range(repeats):
+        run = METRICS.begin_run()
+        t0 = time.perf_counter()
+        if not _attempt(fn): failed += 1
+        times.append((time.perf_counter() - t0) * 1000)
+        calls += run.api_calls
+    times.sort()
+    return {
+        "median_ms": round(statistics.median(times), 3),
+        "min_ms": round(times[0], 3),
+        "p95_ms": round(times[min(len(times) - 1, int(len(times) * 0.95))], 3),
+        "api_calls": round((calls if foreground else _calls(client) - before) / repeats, 2),
+        "throttled": _throttled(client) - throttled,
+        "failed": failed,
+    }
+
+
+def run_paths(client, repeats, anchor=ANCHOR):
+    # main.py 와 같은 app_data 함수(st.cache_resource 포함)를 get_engine() 만 가짜 클라이언트로 바꿔서 호출한다
+    from unittest import mock
+    os.environ.setdefault("STREAMLIT_LOGGER_LEVEL", "error")   # 스크립트 밖에서 st.cache_resource 를 쓸 때 나오는 경고
+    import streamlit as st
+    import app_data
+    from metrics import instrument
+    from attendance import build_attendance_index
+    from work_hours import month_table, month_summary, month_grid as grid_page, staff_pages, week_pages
+    from export import export_tables, build_export
+    from approvals import build_approval_index, HISTORY_PAGE
+
+    biz, mgr, staff = biz_no(0), user_id(0, 0), user_id(0, 5)
+    d_str = anchor.isoformat()
+    st.cache_resource.clear(); st.cache_data.clear()
+    cwd = os.getcwd()
+    engine = instrument(client)
+    with mock.patch.object(app_data, "get_engine", lambda: engine):
+        os.chdir(tempfile.mkdtemp())   # 출퇴근 저널 파일은 임시 폴더에
+        try:
+            # 플러셔 스레드는 멈춰 두고 punch_flush 에서 직접 전송 (측정 중 API 호출 수가 흔들리지 않게)
+            journal = app_data.get_journal()
+            journal.close()
+        finally:
+            os.chdir(cwd)
+
+        def cold_load():
+            for sheet in ("Attendance_Records", "User_List", "결재데이터", "Schedules"): app_data.get_refresher().frame(sheet)
+
+        def login():
+            app_data.user_directory().authenticate(mgr, "pw")
+
+        def sidebar_today():
+            # main.py 사이드바: 오늘 출퇴근 (시트 사본 + 아직 전송 전인 저널 기록)
+            app_data.get_archive_job()
+            app_data.tenant_frame("Attendance_Records", biz)
+            app_data.tenant_index("Attendance_Records", biz, build_attendance_index).get(biz, staff, d_str)
+            app_data.get_journal().pending(biz, staff, d_str)
+
+        def sync_check():
+            # 백그라운드 갱신기가 주기마다 하는 변경 확인 (행 추가 시트는 끝부분, 셀 수정 시트는 변경 확인 열)
+            for sheet in ("Attendance_Records", "User_List", "결재데이터", "Schedules"): app_data.get_sync().frame(sheet)
+
+        def month_grid():
+            idx = app_data.tenant_index("Attendance_Records", biz, build_attendance_index)
+            staffs = app_data.tenant_frame("User_List", biz)
+            work = month_table(idx, biz, anchor.year, anchor.month, staffs)
+            # 근무 관리 화면 첫 페이지 (첫 팀/직원 묶음 x 이번 달 전체)
+            page = next(iter(staff_pages(staffs).values()))
+            days = [d for wd in week_pages(anchor.year, anchor.month).values() for d in wd]
+            grid_page(work, page, anchor.year, anchor.month, days)
+            month_summary(work)
+
+        def approval_inbox():
+            # 결재자 목록 + 내 차례 문서 전체 + 전체 내역 첫 페이지
+            app_data.user_directory().managers(biz)
+            idx = app_data.tenant_index("결재데이터", biz, build_approval_index)
+            for _, row in idx.pending(mgr).iterrows(): list(row['결재자ID'])
+            for _, row in idx.related(mgr, 0, HISTORY_PAGE).iterrows(): list(row['결재자ID'])
+
+        def export_xlsx():
+            start = anchor.replace(day=1)
+            recs = app_data.tenant_frame("Attendance_Records", biz)
+            idx = app_data.tenant_index("Attendance_Records", biz, build_attendance_index)
+            h_recs = app_data.history_frame(biz, start, anchor, hot=recs)
+            h_idx = idx if h_recs is recs else build_attendance_index(h_recs)
+            build_export("xlsx", export_tables(h_recs, app_data.tenant_frame("Schedules", biz), h_idx, biz, start, anchor,
+                                               app_data.tenant_frame("User_List", biz)))
+
+        def clock_in():
+            # 버튼 클릭 -> 저널 기록 -> 재실행한 사이드바 표시 (시트 전송은 punch_flush)
+            app_data.record_punch([biz, staff, "벤치", f"{d_str} 09:00:00", "출근", "", ""])
+            sidebar_today()
+
+        results = {"cold_load": _measure(client, cold_load, 1)}
+        for name, fn in [("login", login), ("sidebar_today", sidebar_today), ("sync_check", sync_check), ("month_grid", month_grid),
+                         ("approval_inbox", approval_inbox), ("export_xlsx", export_xlsx), ("clock_in", clock_in)]:
+            _attempt(fn)  # 첫 호출(인덱스 생성 등)은 제외하고 반복 측정
+            results[name] = _measure(client, fn, repeats)
+        results["punch_flush"] = _measure(client, journal.flush, 1)  # 쌓인 출근 기록을 append_rows 1회로
+        app_data.get_refresher().close()
+    return results
+
+
+def run_app(client, repeats):
+    # main.py 를 streamlit AppTest 로 실행 (get_engine() 이 가짜 클라이언트를 돌려주도록 교체)
+    from unittest import mock
+    import gspread
+    import streamlit as st
+    from google.oauth2 import service_account
+    from streamlit.testing.v1 import AppTest
+
+    st.cache_resource.clear(); st.cache_data.clear()
+    results = {}
+    with mock.patch.object(gspread, "authorize", return_value=client), \
+         mock.patch.object(service_account.Credentials, "from_service_account_info", return_value=None):
+        at = AppTest.from_file(os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py"), default_timeout=600)
+        at.secrets["gcp_service_account"] = {"type": "bench"}
+        at.run()
+        at.text_input(key="login_id").input(user_id(0, 0))
+        at.text_input(key="login_pw").input("pw")
+        t0 = time.perf_counter()
+        at.button[0].click().run()
+        results["app_login"] = {"median_ms": round((time.perf_counter() - t0) * 1000, 3)}
+        for menu in at.sidebar.radio[0].options:
+            at.sidebar.radio[0].set_value(menu).run()
+            if at.exception: raise RuntimeError(f"{menu}: {at.exception}")
+            results[f"app_{menu}"] = _measure(client, at.run, repeats, foreground=False)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    # 중앙값이 허용 비율 이상 (그리고 1ms 이상) 느려졌거나 API 호출 수가 늘면 회귀
+    bad = []
+    for name, base in baseline.get("results", {}).items():
+        cur = results.get(name)
+        if cur is None: continue
+        if cur["median_ms"] > base["median_ms"] * (1 + tolerance) and cur["median_ms"] - base["median_ms"] > 1:
+            bad.append(f"{name}: {base['median_ms']}ms -> {cur['median_ms']}ms")
+        if cur.get("api_calls", 0) > base.get("api_calls", 0):
+            bad.append(f"{name}: API {base.get('api_calls', 0)} -> {cur['api_calls']} 회")
+    return bad
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="디딤돌HR 오프라인 벤치마크")
+    p.add_argument("--size", choices=list(SIZES), default="medium")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--repeats", type=int, default=20)
+    p.add_argument("--latency", type=float, default=0.0, help="API 호출당 지연 (초)")
+    p.add_argument("--read-quota", type=int, default=None, help="분당 읽기 호출 한도")
+    p.add_argument("--write-quota", type=int, default=None, help="분당 쓰기 호출 한도")
+    p.add_argument("--app", action="store_true", help="main.py 화면 렌더링도 측정")
+    p.add_argument("--out", help="결과 JSON 저장 경로")
+    p.add_argument("--compare", help="비교할 기준 결과 JSON")
+    p.add_argument("--tolerance", type=float, default=0.25)
+    args = p.parse_args(argv)
+
+    cfg = dict(SIZES[args.size], seed=args.seed)
+    t0 = time.perf_counter()
+    sheets = synthetic_sheets(**cfg)
+    client = FakeClient(sheets, latency=args.latency, read_quota=args.read_quota, write_quota=args.write_quota)
+    print(f"# 데이터 생성 {time.perf_counter() - t0:.1f}s: " + ", ".join(f"{k} {len(v) - 1}행" for k, v in sheets.items()))
+
+    results = run_paths(client, args.repeats)
+    if args.app: results.update(run_app(client, max(1, args.repeats // 5)))
+
+    for name, r in results.items():
+        print(f"{name:<24} median {r['median_ms']:>10.3f} ms   api {r.get('api_calls', '-')}" + (f"   429 {r['throttled']}" if r.get("throttled") else ""))
+    report = {"config": dict(cfg, size=args.size, repeats=args.repeats, latency=args.latency), "results": results}
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f: json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f: bad = compare(results, json.load(f), args.tolerance)
+        for line in bad: print("회귀:", line)
+        return 1 if bad else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
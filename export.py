@@ -0,0 +1,126 @@
+# --- 데이터 추출 ---
+# 사업장/기간으로 걸러낸 표들을 행 묶음(CHUNK_ROWS) 단위로 임시 파일에 바로 써서
+# 행 수가 늘어도 생성 중 메모리 사용량이 일정하게 유지되도록 한다.
+#  - xlsx    : openpyxl write-only 모드
+#  - csv     : 표마다 CSV 1개씩 zip 으로 묶음 (엑셀 한글 깨짐 방지 utf-8-sig)
+#  - parquet : 표마다 parquet 1개씩 zip 으로 묶음 (pyarrow)
+import io
+import tempfile
+import zipfile
+
+import pandas as pd
+from openpyxl import Workbook
+
+from journal import KEY_COL, KEY_PREFIX
+from schema import TS_FORMAT, days_of
+from work_hours import month_table, month_summary
+
+CHUNK_ROWS = 5000
+EXPORT_FORMATS = {"Excel (.xlsx)": "xlsx", "CSV (.zip)": "csv", "Parquet (.zip)": "parquet"}
+FILE_EXT = {"xlsx": "xlsx", "csv": "zip", "parquet": "zip"}
+
+
+def filter_dates(df, col, start, end):
+    # start ~ end (양끝 포함) 날짜의 행만. 일시를 읽을 수 없는 기록도 앞의 날짜로 포함 (근무 관리 표의 '오류' 와 맞춤)
+    if df.empty or col not in df.columns: return df
+    d = days_of(df[col])
+    return df[(d >= pd.Timestamp(start)) & (d <= pd.Timestamp(end))]
+
+
+def time_text(df, col):
+    # 원문이 섞인 일시 열(object)은 문자열 열로 (parquet 은 Timestamp 와 문자열이 섞인 열을 쓸 수 없음)
+    if col not in df.columns or df[col].dtype != object: return df
+    df = df.copy()
+    df[col] = [v.strftime(TS_FORMAT) if isinstance(v, pd.Timestamp) else ("" if pd.isna(v) else str(v)) for v in df[col]]
+    return df
+
+
+def strip_punch_keys(recs):
+    # 출퇴근 저널이 '기타' 칸에 적는 멱등 키(punch:...)는 내부용이라 내보내지 않는다
+    if recs.shape[1] <= KEY_COL: return recs
+    hit = recs.iloc[:, KEY_COL].astype(str).str.startswith(KEY_PREFIX).to_numpy()
+    if not hit.any(): return recs
+    recs = recs.copy()
+    recs.iloc[hit, KEY_COL] = ""
+    return recs
+
+
+def _months(start, end):
+    y, m = start.year, start.month
+    while (y, m) <= (end.year, end.month):
+        yield y, m
+        y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+
+
+def period_work(idx, biz, start, end, staffs=None):
+    # 기간에 걸친 월마다 월간 근로시간 표를 계산해서 (일별 표, 월별 요약) 으로 합친다
+    tables, summaries = [], []
+    for y, m in _months(start, end):
+        t = month_table(idx, biz, y, m, staffs)
+        t = t[(t["날짜"] >= start.isoformat()) & (t["날짜"] <= end.isoformat())]
+        tables.append(t)
+        summaries.append(month_summary(t).assign(월=f"{y}-{m:02d}"))
+    table = pd.concat(tables, ignore_index=True)
+    summary = pd.concat(summaries, ignore_index=True)
+    return table, summary[["월"] + [c for c in summary.columns if c != "월"]]
+
+
+def export_tables(recs, schedules, idx, biz, start, end, staffs=None):
+    work, summary = period_work(idx, biz, start, end, staffs)
+    return [
+        ("근태기록", time_text(strip_punch_keys(filter_dates(recs, '일시', start, end)), '일시')),
+        ("일정", filter_dates(schedules, '날짜', start, end)),
+        ("월간근무", work),
+        ("월간요약", summary),
+    ]
+
+
+def _chunks(df):
+    for i in range(0, len(df), CHUNK_ROWS): yield df.iloc[i:i + CHUNK_ROWS]
+
+
+def _cell(v):
+    return None if v is None or (not isinstance(v, str) and pd.isna(v)) else v
+
+
+def _write_xlsx(fh, tables):
+    wb = Workbook(write_only=True)
+    for name, df in tables:
+        ws = wb.create_sheet(name)
+        ws.append([str(c) for c in df.columns])
+        for chunk in _chunks(df):
+            for row in chunk.itertuples(index=False, name=None): ws.append([_cell(v) for v in row])
+    wb.save(fh)
+
+
+def _write_csv(fh, tables):
+    with zipfile.ZipFile(fh, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, df in tables:
+            with zf.open(f"{name}.csv", "w") as raw, io.TextIOWrapper(raw, encoding="utf-8-sig", newline="") as out:
+                df.iloc[0:0].to_csv(out, index=False)
+                for chunk in _chunks(df): chunk.to_csv(out, index=False, header=False)
+
+
+def _write_parquet(fh, tables):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    with zipfile.ZipFile(fh, "w", zipfile.ZIP_STORED) as zf:
+        for name, df in tables:
+            schema = pa.Schema.from_pandas(df, preserve_index=False)
+            with zf.open(f"{name}.parquet", "w") as out, pq.ParquetWriter(out, schema) as writer:
+                for chunk in _chunks(df): writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+_WRITERS = {"xlsx": _write_xlsx, "csv": _write_csv, "parquet": _write_parquet}
+
+
+def build_export(fmt, tables):
+    # 임시 파일에 스트리밍으로 쓴 뒤 완성된 파일 내용만 반환
+    with tempfile.TemporaryFile() as fh:
+        _WRITERS[fmt](fh, tables)
+        fh.seek(0)
+        return fh.read()
+
+
+def export_file_name(fmt, start, end):
+    return f"HR_Data_{start}_{end}.{FILE_EXT[fmt]}"
@@ -0,0 +1,223 @@
+# --- 오프라인용 가짜 구글 시트 백엔드 ---
+# gspread Client/Spreadsheet/Worksheet 중 main.py 가 쓰는 메서드만 흉내낸다.
+# 네트워크 없이 동기화/쓰기 로직을 검증하거나 부하를 재현할 때 사용.
+# latency(초) 로 API 왕복 지연을, read_quota/write_quota(분당 호출 수) 로 429 할당량 초과를 재현할 수 있다.
+import re
+import time
+from collections import deque
+
+from gspread.exceptions import APIError, WorksheetNotFound
+
+_A1 = re.compile(r"^([A-Z]+)?(\d+)?(?::([A-Z]+)?(\d+)?)?$")
+
+
+def _col_index(letters):
+    n = 0
+    for ch in letters: n = n * 26 + (ord(ch) - 64)
+    return n
+
+
+def _col_letter(n):
+    s = ""
+    while n > 0:
+        n, r = divmod(n - 1, 26)
+        s = chr(65 + r) + s
+    return s
+
+
+def _parse_range(rng):
+    # "A5:G" -> (5, 1, None, 7) : (시작행, 시작열, 끝행, 끝열), None 은 끝까지
+    rng = rng.split("!")[-1]
+    m = _A1.match(rng.strip().upper())
+    if not m: raise ValueError(f"지원하지 않는 범위: {rng}")
+    c1, r1, c2, r2 = m.groups()
+    if c2 is None and r2 is None and ":" not in rng:
+        c2, r2 = c1, r1
+    return (int(r1) if r1 else 1, _col_index(c1) if c1 else 1,
+            int(r2) if r2 else None, _col_index(c2) if c2 else None)
+
+
+class _QuotaResponse:
+    status_code = 429
+    text = "Quota exceeded"
+
+    def json(self):
+        return {"error": {"code": 429, "message": "Quota exceeded (fake)", "status": "RESOURCE_EXHAUSTED"}}
+
+
+class FakeCell:
+    def __init__(self, row, col, value):
+        self.row, self.col, self.value = row, col, value
+
+
+class FakeWorksheet:
+    def __init__(self, spreadsheet, title, rows=None, sheet_id=0):
+        self.spreadsheet = spreadsheet
+        self.title = title
+        self.id = sheet_id
+        self._rows = [list(map(str, r)) for r in (rows or [])]
+
+    # --- 내부 ---
+    def _touch(self, kind, n=1):
+        self.spreadsheet._record(self.title, kind, n)
+
+    def _width(self):
+        return max((len(r) for r in self._rows), default=0)
+
+    def _padded(self, rows, width):
+        return [r + [""] * (width - len(r)) for r in rows]
+
+    def _ensure(self, row, col):
+        while len(self._rows) < row: self._rows.append([])
+        r = self._rows[row - 1]
+        if len(r) < col: r.extend([""] * (col - len(r)))
+
+    # --- 읽기 ---
+    @property
+    def row_count(self):
+        return len(self._rows)
+
+    def get_all_values(self):
+        self._touch("read")
+        return self._padded([list(r) for r in self._rows], self._width())
+
+    def get_values(self, range_name=None):
+        self._touch("read")
+        return self._values(range_name)
+
+    get = get_values
+
+    def batch_get(self, ranges, **kwargs):
+        # 여러 범위를 API 호출 1회로
+        self._touch("read")
+        return [self._values(r) for r in ranges]
+
+    def _values(self, range_name):
+        if range_name is None:
+            return self._padded([list(r) for r in self._rows], self._width())
+        r1, c1, r2, c2 = _parse_range(range_name)
+        r2 = len(self._rows) if r2 is None else min(r2, len(self._rows))
+        c2 = self._width() if c2 is None else c2
+        out = [(self._rows[i] + [""] * c2)[c1 - 1:c2] for i in range(r1 - 1, r2)]
+        while out and not any(out[-1]): out.pop()
+        return out
+
+    def col_values(self, col):
+        self._touch("read")
+        return [r[col - 1] if len(r) >= col else "" for r in self._rows]
+
+    def find(self, query, in_row=None, in_column=None):
+        self._touch("read")
+        for i, r in enumerate(self._rows):
+            if in_row is not None and i + 1 != in_row: continue
+            for j, v in enumerate(r):
+                if in_column is not None and j + 1 != in_column: continue
+                if v == str(query): return FakeCell(i + 1, j + 1, v)
+        return None
+
+    # --- 쓰기 ---
+    def append_row(self, values, **kwargs):
+        self.append_rows([values])
+
+    def append_rows(self, values, **kwargs):
+        self._touch("write")
+        start = len(self._rows) + 1
+        self._rows.extend([list(map(str, r)) for r in values])
+        end = f"{_col_letter(max((len(r) for r in values), default=1))}{len(self._rows)}"
+        return {"updates": {"updatedRange": f"'{self.title}'!A{start}:{end}", "updatedRows": len(values)}}
+
+    def update_cell(self, row, col, value):
+        self._touch("write")
+        self._ensure(row, col)
+        self._rows[row - 1][col - 1] = str(value)
+
+    def batch_update(self, data, **kwargs):
+        self._touch("write")
+        for item in data: self._set(item)
+
+    def _set(self, item):
+        r1, c1, _, _ = _parse_range(item["range"])
+        for di, vals in enumerate(item["values"]):
+            for dj, v in enumerate(vals):
+                self._ensure(r1 + di, c1 + dj)
+                self._rows[r1 + di - 1][c1 + dj - 1] = str(v)
+
+
+class FakeSpreadsheet:
+    def __init__(self, sheets=None, latency=0.0, read_quota=None, write_quota=None):
+        self.calls = {}
+        self.latency = latency
+        self.quota = {"read": read_quota, "meta": read_quota, "write": write_quota}
+        self._window = {"read": deque(), "write": deque()}
+        self._sheets = []
+        for title, rows in (sheets or {}).items(): self.add_worksheet(title, rows)
+
+    def _record(self, title, kind, n=1):
+        self._throttle(title, kind)
+        key = (title, kind)
+        self.calls[key] = self.calls.get(key, 0) + n
+        if self.latency: time.sleep(self.latency)
+
+    def _throttle(self, title, kind):
+        # 분당 호출 수 제한 (읽기/메타데이터는 같은 읽기 할당량을 쓴다)
+        limit = self.quota.get(kind)
+        if not limit: return
+        window = self._window["write" if kind == "write" else "read"]
+        now = time.monotonic()
+        while window and now - window[0] >= 60: window.popleft()
+        if len(window) >= limit:
+            key = (title, "429")
+            self.calls[key] = self.calls.get(key, 0) + 1
+            raise APIError(_QuotaResponse())
+        window.append(now)
+
+    def reset_calls(self):
+        self.calls = {}
+
+    def add_worksheet(self, title, rows=None, cols=None, **kwargs):
+        # gspread 처럼 rows 가 행 수(int)면 빈 시트, 목록이면 초기 데이터
+        if isinstance(rows, int): self._record(title, "write")
+        ws = FakeWorksheet(self, title, None if isinstance(rows, int) else rows, sheet_id=len(self._sheets) + 1)
+        self._sheets.append(ws)
+        return ws
+
+    def worksheet(self, title):
+        self._record(title, "meta")
+        for ws in self._sheets:
+            if ws.title == title: return ws
+        raise WorksheetNotFound(title)
+
+    def get_worksheet(self, index):
+        self._record(index, "meta")
+        return self._sheets[index] if index < len(self._sheets) else None
+
+    def worksheets(self):
+        return list(self._sheets)
+
+    def values_batch_update(self, body=None):
+        # 여러 시트에 걸친 셀 수정도 API 호출 1회로 기록
+        by_title = {}
+        for item in (body or {}).get("data", []):
+            title, rng = item["range"].rsplit("!", 1)
+            by_title.setdefault(title.strip("'"), []).append({"range": rng, "values": item["values"]})
+        self._record(None, "write")
+        for title, data in by_title.items():
+            ws = self.worksheet(title)
+            for item in data: ws._set(item)
+
+    def batch_update(self, body):
+        # 시트 구조 변경 요청 중 deleteDimension(행 삭제)만 지원
+        self._record(None, "write")
+        for req in body.get("requests", []):
+            rng = req["deleteDimension"]["range"]
+            ws = next(w for w in self._sheets if w.id == rng["sheetId"])
+            del ws._rows[rng["startIndex"]:rng["endIndex"]]
+        return {"replies": [{} for _ in body.get("requests", [])]}
+
+
+class FakeClient:
+    def __init__(self, sheets=None, **kwargs):
+        self.spreadsheet = FakeSpreadsheet(sheets, **kwargs)
+
+    def open_by_key(self, key):
+        return self.spreadsheet
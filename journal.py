@@ -0,0 +1,163 @@
+# --- 출퇴근 기록 로컬 저널 ---
+# 출근/퇴근 버튼은 시트에 바로 쓰지 않고 로컬 SQLite 저널에 먼저 저장한 뒤 화면에 즉시 반영한다.
+# 백그라운드 플러셔가 쌓인 기록을 append_rows 한 번으로 모아 보내고, 실패하면 간격을 늘려 재시도한다.
+# 각 기록의 '기타' 칸에 멱등 키(punch:<키>)를 함께 적어서, 응답 없이 실패한 전송을 재시도할 때
+# 시트에 이미 들어간 기록은 다시 보내지 않는다.
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+JOURNAL_PATH = "punch_journal.db"
+SHEET = "Attendance_Records"
+KEY_COL = 6          # '기타' 열 위치 (0부터)
+KEY_PREFIX = "punch:"
+FLUSH_SEC = 2        # 플러시 주기 (버튼을 누르면 바로 깨움)
+BATCH_ROWS = 200     # 한 번에 보내는 최대 행 수
+RETRY_MAX_SEC = 60   # 재시도 간격 상한
+RECENT_SEC = 60      # 전송 직후 사본 반영 전까지 화면에 계속 보여줄 시간
+
+log = logging.getLogger("didimdol.journal")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS punches (
+    key TEXT PRIMARY KEY,
+    biz TEXT NOT NULL,
+    uid TEXT NOT NULL,
+    day TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    at TEXT NOT NULL,
+    row TEXT NOT NULL,
+    created REAL NOT NULL,
+    flushed REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_try REAL NOT NULL DEFAULT 0,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS punches_pending ON punches (flushed, created);
+CREATE INDEX IF NOT EXISTS punches_user ON punches (biz, uid, day);
+"""
+
+
+class PunchJournal:
+    def __init__(self, writer, path=JOURNAL_PATH, interval=FLUSH_SEC):
+        self.writer = writer
+        self.path = os.path.abspath(path)   # 작업 폴더가 바뀌어도 같은 파일
+        self.interval = interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._flush_lock = threading.Lock()
+        with self._db() as db: db.executescript(_SCHEMA)
+        self._thread = threading.Thread(target=self._loop, name="punch-flusher", daemon=True)
+        self._thread.start()
+
+    def _db(self):
+        db = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=FULL")
+        return _Conn(db)
+
+    # --- 기록 ---
+    def record(self, row):
+        # row: [사업자번호, 아이디, 이름, 일시, 구분, 비고, 기타]. 저널에 커밋되면 전송 전이라도 기록은 보존된다
+        key = uuid.uuid4().hex
+        row = [str(v) for v in row]
+        row[KEY_COL] = KEY_PREFIX + key
+        with self._db() as db:
+            db.execute("INSERT INTO punches (key, biz, uid, day, kind, at, row, created) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                       (key, row[0], row[1], row[3][:10], row[4], row[3], json.dumps(row, ensure_ascii=False), time.time()))
+        self._wake.set()
+        return key
+
+    def pending(self, biz, uid, day):
+        # 아직 전송되지 않았거나 방금 전송된 기록 -> {구분: 일시} (화면 즉시 반영용)
+        with self._db() as db:
+            rows = db.execute("SELECT kind, at FROM punches WHERE biz = ? AND uid = ? AND day = ? AND (flushed IS NULL OR flushed > ?) ORDER BY created",
+                              (str(biz), str(uid), day, time.time() - RECENT_SEC)).fetchall()
+        out = {}
+        for kind, at in rows:
+            if kind == "출근" and kind in out: continue  # 출근은 첫 기록, 퇴근은 마지막 기록
+            out[kind] = at
+        return out
+
+    def backlog(self):
+        # (전송 대기 건수, 마지막 오류)
+        with self._db() as db:
+            n, err = db.execute("SELECT COUNT(*), MAX(error) FROM punches WHERE flushed IS NULL").fetchone()
+        return n, err
+
+    # --- 전송 ---
+    def flush(self):
+        with self._flush_lock:
+            now = time.time()
+            with self._db() as db:
+                due = db.execute("SELECT key, row, attempts FROM punches WHERE flushed IS NULL AND next_try <= ? ORDER BY created LIMIT ?",
+                                 (now, BATCH_ROWS)).fetchall()
+            if not due: return 0
+            keys = [k for k, _, _ in due]
+            rows = {k: json.loads(r) for k, r, _ in due}
+            attempts = {k: a for k, _, a in due}
+            if any(attempts.values()):
+                # 이전 전송이 실패(또는 전송 중 종료)로 끝났어도 시트에는 들어갔을 수 있으므로 멱등 키로 확인
+                done = self._on_sheet(keys)
+                if done: self._mark(done)
+                keys = [k for k in keys if k not in done]
+            if not keys: return 0
+            # 보내기 전에 시도 횟수를 먼저 기록 (전송 직후 프로세스가 죽어도 다음 플러시가 시트를 확인하도록)
+            with self._db() as db:
+                db.executemany("UPDATE punches SET attempts = attempts + 1 WHERE key = ?", [(k,) for k in keys])
+            try:
+                with self.writer.batch() as wb:
+                    for k in keys: wb.append_row(SHEET, rows[k])
+            except Exception as e:
+                self._fail(keys, attempts, e)
+                return 0
+            self._mark(keys)
+            return len(keys)
+
+    def close(self):
+        self._stop.set()
+        self._wake.set()
+
+    def _on_sheet(self, keys):
+        df = self.writer.sync.frame(SHEET)
+        if df.empty or df.shape[1] <= KEY_COL: return []
+        seen = set(df.iloc[:, KEY_COL].astype(str))
+        return [k for k in keys if KEY_PREFIX + k in seen]
+
+    def _mark(self, keys):
+        now = time.time()
+        with self._db() as db:
+            db.executemany("UPDATE punches SET flushed = ?, error = NULL WHERE key = ?", [(now, k) for k in keys])
+
+    def _fail(self, keys, attempts, e):
+        log.warning("출퇴근 기록 전송 실패 (%d건, 재시도 예정): %s", len(keys), e)
+        now = time.time()
+        with self._db() as db:
+            db.executemany("UPDATE punches SET error = ?, next_try = ? WHERE key = ?",
+                           [(str(e)[:200], now + min(RETRY_MAX_SEC, 2 ** attempts[k]), k) for k in keys])
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                log.warning("출퇴근 기록 플러시 오류: %s", e)
+
+
+class _Conn:
+    # with 블록이 끝나면 연결을 닫는다 (sqlite3 기본 컨텍스트 매니저는 닫지 않음)
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        return self.db
+
+    def __exit__(self, *exc):
+        self.db.close()
+        return False
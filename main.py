@@ -1,59 +1,52 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime, date, timedelta
-import gspread
-from google.oauth2.service_account import Credentials
 import os
 import base64
-import io
 import calendar
 import re
 import streamlit.components.v1 as components
+from attendance import build_attendance_index
+from work_hours import month_table, month_summary, month_grid, grid_style, staff_pages, week_pages, fmt_minutes, WARN_STATUSES, TEAM_COL
+from schedules import build_schedule_index, month_schedules
+from approvals import ApprovalConflict, build_approval_index, approvers_of, HISTORY_PAGE
+from export import EXPORT_FORMATS, export_tables, build_export, export_file_name, filter_dates
+from archive import hot_start
+from metrics import METRICS, READ_QUOTA_PER_MIN, WRITE_QUOTA_PER_MIN
 
-# --- 1. 데이터 엔진 ---
-SPREADSHEET_ID = "15IPQ_1T5e2aGlyTuDmY_VYBZsT6bui4LYZ5bLmuyKxU"
+# --- 1. 데이터 엔진 (app_data.py) ---
+from app_data import (get_writer, get_journal, record_punch, get_approvals, tenant_frame, tenant_index,
+                      user_directory, history_frame, get_archive_job)
 
-@st.cache_resource
-def get_engine():
+def metrics_panel_enabled():
+    # secrets 의 metrics_panel = true 일 때만 관리자 사이드바에 성능 지표 표시
     try:
-        if "gcp_service_account" not in st.secrets:
-            st.error("🚨 Secrets 설정이 비어있습니다.")
-            return None
+        return bool(st.secrets.get("metrics_panel", False))
+    except Exception:
+        return False
 
-        scope = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
-        creds_info = dict(st.secrets["gcp_service_account"])
-        
-        if "private_key" in creds_info:
-            creds_info["private_key"] = creds_info["private_key"].replace("\\n", "\n")
-            
-        credentials = Credentials.from_service_account_info(creds_info, scopes=scope)
-        client = gspread.authorize(credentials)
-        client.open_by_key(SPREADSHEET_ID) # 연결 테스트
-        return client
-
-    except Exception as e:
-        st.error(f"🚨 구글 연결 오류:\n{e}")
-        return None
-
-@st.cache_data(ttl=2)
-def fetch(sheet_name): 
-    engine = get_engine()
-    if engine is None: return pd.DataFrame()
-    try:
-        if isinstance(sheet_name, int):
-            ws = engine.open_by_key(SPREADSHEET_ID).get_worksheet(sheet_name)
-        else:
-            ws = engine.open_by_key(SPREADSHEET_ID).worksheet(sheet_name)
-            
-        data = ws.get_all_values()
-        if not data or len(data) < 1: return pd.DataFrame()
-        df = pd.DataFrame(data[1:], columns=data[0])
-        df.columns = [str(c).strip() for c in df.columns]
-        return df
-    except Exception as e:
-        return pd.DataFrame()
+def render_metrics_panel():
+    run, quota = METRICS.current(), METRICS.quota_usage()
+    with st.sidebar.expander("📈 성능 지표"):
+        bg = METRICS.background_since(run)
+        st.caption(f"이번 실행: {run.elapsed_ms():.0f}ms | API {run.api_calls}회 {run.api_ms:.0f}ms | {run.rows}행 {run.bytes / 1024:.1f}KB")
+        st.caption(f"같은 시간 백그라운드 갱신: API {bg['api_calls']}회 {bg['api_ms']:.0f}ms")
+        st.caption(f"최근 60초 호출: 읽기 {quota['read']}/{READ_QUOTA_PER_MIN} | 쓰기 {quota['write']}/{WRITE_QUOTA_PER_MIN}")
+        if get_journal() is not None:
+            n, err = get_journal().backlog()
+            st.caption(f"출퇴근 전송 대기: {n}건" + (f" | 마지막 오류: {err}" if err else ""))
+        job = get_archive_job()
+        if job is not None and job.last_day is not None:
+            st.caption(f"근태 기록 보관 ({job.last_day}): {job.last_result}")
+        st.dataframe(pd.DataFrame(METRICS.sheet_table()), use_container_width=True, hide_index=True)
+        st.dataframe(pd.DataFrame(METRICS.cache_table()), use_container_width=True, hide_index=True)
+        st.dataframe(pd.DataFrame(METRICS.menu_table()), use_container_width=True, hide_index=True)
 
 # --- 유틸: 시간 계산 ---
+def hms(ts):
+    # 일시(Timestamp 또는 "YYYY-MM-DD HH:MM:SS") -> "HH:MM:SS"
+    return pd.Timestamp(ts).strftime("%H:%M:%S")
+
 def smart_time_parser(val, current_sec=0):
     val = str(val).strip().replace(" ", "")
     try:
@@ -80,12 +73,12 @@ def get_base64_img(path):
 # --- 2. 전자결재 시스템 ---
 def run_approval_system(u, db):
     st.header("📝 전자결재 시스템")
-    udf = fetch("User_List")
-    if udf.empty: return
+    users = user_directory()
+    if not len(users): return
 
-    mgr_df = udf[(udf['사업자번호'].astype(str) == str(u['사업자번호'])) & (udf['권한'] == 'Manager')]
-    mgr_map = {row['아이디']: row['이름'] for _, row in mgr_df.iterrows()}
-    mgr_options = {f"{row['이름']} ({row['아이디']})": row['아이디'] for _, row in mgr_df.iterrows()}
+    managers = users.managers(u['사업자번호'])
+    mgr_map = dict(managers)
+    mgr_options = {f"{name} ({mid})": mid for mid, name in managers}
     
     t1, t2 = st.tabs(["📄 새 결재 기안", "📥 결재함 현황"])
     
@@ -109,73 +102,71 @@ def run_approval_system(u, db):
                 approvers = [mgr_options[app1]]
                 if app2 != "없음": approvers.append(mgr_options[app2])
                 try:
-                    sheet_app = db.open_by_key(SPREADSHEET_ID).worksheet("결재데이터")
                     now_kst = (datetime.now() + timedelta(hours=9)).strftime("%Y-%m-%d %H:%M:%S")
                     new_row = [f"APP-{datetime.now().strftime('%Y%m%d%H%M%S')}", str(u['사업자번호']), u['아이디'], u['이름'], doc_type, title, detail_content, "대기", now_kst, "", ",".join(approvers)]
-                    sheet_app.append_row(new_row)
-                    st.success("기안서가 송신되었습니다."); st.cache_data.clear()
+                    get_approvals().submit(new_row)
+                    st.success("기안서가 송신되었습니다.")
                 except Exception as e: st.error(f"저장 오류: {e}")
 
     with t2:
         st.subheader("결재 내역 모니터링")
-        df_app = fetch("결재데이터")
-        if not df_app.empty:
-            my_biz = df_app[df_app['사업자번호'].astype(str) == str(u['사업자번호'])]
-            display_df = my_biz[(my_biz['기안자ID'] == str(u['아이디'])) | (my_biz['결재자ID'].str.contains(str(u['아이디'])))]
-            for _, row in display_df.iterrows():
-                actual_row = int(row.name) + 2 
-                approver_ids = row['결재자ID'].split(',')
-                with st.expander(f"[{row['상태']}] {row['제목']} (기안:{row['이름']})"):
-                    stamp_html = "<div style='display: flex; justify-content: flex-end; margin-bottom: 20px;'>"
-                    for i, aid in enumerate(approver_ids):
-                        name = mgr_map.get(aid, "관리자")
-                        s_text = "대기"
-                        if row['상태'] == "승인": s_text = "승인 완"
-                        elif row['상태'] == "1차 승인" and i == 0: s_text = "승인 완"
-                        stamp_html += f"<div style='border: 1px solid #333; width: 70px; text-align: center; margin-left: -1px; color: black;'><div style='background: #f8f9fa; border-bottom: 1px solid #333; font-size: 10px; padding: 2px;'>{i+1}차 결재</div><div style='padding: 8px 2px; font-weight: bold; font-size: 12px;'>{name}</div><div style='border-top: 1px dotted #ccc; color: #d9534f; font-size: 9px; padding: 2px;'>{s_text}</div></div>"
-                    stamp_html += "</div>"
-                    
-                    doc_body = f"<div style='border: 2px solid #000; padding: 40px; background-color: #fff; color: #000;'><h1 style='text-align: center; text-decoration: underline;'>{row['결재유형']}</h1>{stamp_html}<table style='width: 100%; border-collapse: collapse; border: 1px solid #000;'><tr><td style='border: 1px solid #000; padding: 10px; background: #f2f2f2; font-weight:bold;'>기안자</td><td style='border: 1px solid #000; padding: 10px;'>{row['이름']}</td></tr><tr><td style='border: 1px solid #000; padding: 10px; background: #f2f2f2; font-weight:bold;'>제목</td><td style='border: 1px solid #000; padding: 10px;'>{row['제목']}</td></tr><tr><td colspan='2' style='border: 1px solid #000; padding: 30px; height: 200px; vertical-align: top;'>{row['내용'].replace('|', '<br>')}</td></tr></table></div>"
-                    st.markdown(doc_body, unsafe_allow_html=True)
-                    
-                    if st.button("📄 기안서 출력", key=f"prt_{row['결재ID']}"):
-                        safe_body = doc_body.replace("'", "\\'").replace("\n", "")
-                        components.html(f"<script>var pwin = window.open('', '_blank'); pwin.document.write('<html><body>{safe_body}</body></html>'); pwin.document.close(); setTimeout(function(){{ pwin.print(); pwin.close(); }}, 500);</script>", height=0)
-                    
-                    uid, stat = str(u['아이디']), row['상태']
-                    if (uid in approver_ids) and stat != "승인":
-                        can_approve = False
-                        next_stat = "승인"
-                        if uid == approver_ids[0] and stat == "대기":
-                            can_approve = True
-                            if len(approver_ids) > 1: next_stat = "1차 승인"
-                        elif len(approver_ids) > 1 and uid == approver_ids[1] and stat == "1차 승인":
-                            can_approve = True
-                        
-                        if can_approve:
-                            if st.button("✅ 승인 완료하기", key=f"ok_{row['결재ID']}", type="primary", use_container_width=True):
-                                # 1. 결재 데이터 업데이트
-                                db.open_by_key(SPREADSHEET_ID).worksheet("결재데이터").update_cell(actual_row, 8, next_stat)
-                                now_kst = (datetime.now() + timedelta(hours=9)).strftime("%Y-%m-%d %H:%M:%S")
-                                db.open_by_key(SPREADSHEET_ID).worksheet("결재데이터").update_cell(actual_row, 10, now_kst)
-                                
-                                # 2. 일정 연동 (연차인 경우 Schedules 시트에 추가)
-                                if next_stat == "승인" and "연차" in row['결재유형']:
-                                    try:
-                                        d_match = re.search(r'\d{4}-\d{2}-\d{2}', row['내용'])
-                                        if d_match:
-                                            # Schedules 시트 존재 여부 확인
-                                            sheet_sch = db.open_by_key(SPREADSHEET_ID).worksheet("Schedules")
-                                            sheet_sch.append_row([str(u['사업자번호']), d_match.group(), row['이름'], f"[연차] {row['제목']}"])
-                                            st.toast("📅 일정이 홈 캘린더에 공유되었습니다!")
-                                    except Exception as e:
-                                        st.error(f"⚠️ 승인은 되었으나 일정 공유 실패 (Schedules 시트 확인 필요): {e}")
-
-                                st.success("승인 완료."); st.cache_data.clear(); st.rerun()
+        # 결재데이터가 바뀔 때만 만드는 인덱스에서 내 차례 문서 / 관련 문서를 바로 조회 (전체 스캔 없음)
+        ap_idx = tenant_index("결재데이터", u['사업자번호'], build_approval_index)
+        uid = str(u['아이디'])
+        todo = ap_idx.pending(uid)
+        
+        st.markdown(f"##### 📥 내가 결재할 문서 ({len(todo)}건)")
+        for _, row in todo.iterrows():
+            render_approval_doc(row, mgr_map, "todo")
+            if st.button("✅ 승인 완료하기", key=f"ok_{row['결재ID']}", type="primary", use_container_width=True):
+                now_kst = (datetime.now() + timedelta(hours=9)).strftime("%Y-%m-%d %H:%M:%S")
+                # 최종 승인되는 연차는 승인 반영 후 Schedules 에 일정 추가 (실패해도 승인은 유지)
+                extra = []
+                d_match = re.search(r'\d{4}-\d{2}-\d{2}', str(row['내용']))
+                if "연차" in str(row['결재유형']) and d_match:
+                    extra.append(("Schedules", [str(u['사업자번호']), d_match.group(), row['이름'], f"[연차] {row['제목']}"]))
+                try:
+                    nxt, failed = get_approvals().approve(row, uid, now_kst, extra)
+                    for _, e in failed: st.error(f"⚠️ 승인은 되었으나 일정 공유 실패 (Schedules 시트 확인 필요): {e}")
+                    if nxt == "승인" and extra and not failed: st.toast("📅 일정이 홈 캘린더에 공유되었습니다!")
+                    st.success("승인 완료.")
+                    if not failed: st.rerun()
+                except ApprovalConflict as e: st.warning(f"⚠️ {e}")
+                except Exception as e: st.error(f"⚠️ 결재 처리 오류: {e}")
+        
+        st.divider()
+        total = ap_idx.count(uid)
+        st.markdown(f"##### 🗂️ 전체 내역 ({total}건)")
+        if total:
+            # 오래된 문서가 많아도 한 페이지(HISTORY_PAGE 건)만 그린다
+            pages = (total - 1) // HISTORY_PAGE + 1
+            page = st.number_input("페이지", min_value=1, max_value=pages, value=1) if pages > 1 else 1
+            for _, row in ap_idx.related(uid, (page - 1) * HISTORY_PAGE, HISTORY_PAGE).iterrows():
+                render_approval_doc(row, mgr_map, "all")
         else: st.info("내역이 없습니다.")
 
+def render_approval_doc(row, mgr_map, key):
+    approver_ids = list(approvers_of(row['결재자ID']))
+    with st.expander(f"[{row['상태']}] {row['제목']} (기안:{row['이름']})"):
+        stamp_html = "<div style='display: flex; justify-content: flex-end; margin-bottom: 20px;'>"
+        for i, aid in enumerate(approver_ids):
+            name = mgr_map.get(aid, "관리자")
+            s_text = "대기"
+            if row['상태'] == "승인": s_text = "승인 완"
+            elif row['상태'] == "1차 승인" and i == 0: s_text = "승인 완"
+            stamp_html += f"<div style='border: 1px solid #333; width: 70px; text-align: center; margin-left: -1px; color: black;'><div style='background: #f8f9fa; border-bottom: 1px solid #333; font-size: 10px; padding: 2px;'>{i+1}차 결재</div><div style='padding: 8px 2px; font-weight: bold; font-size: 12px;'>{name}</div><div style='border-top: 1px dotted #ccc; color: #d9534f; font-size: 9px; padding: 2px;'>{s_text}</div></div>"
+        stamp_html += "</div>"
+        
+        doc_body = f"<div style='border: 2px solid #000; padding: 40px; background-color: #fff; color: #000;'><h1 style='text-align: center; text-decoration: underline;'>{row['결재유형']}</h1>{stamp_html}<table style='width: 100%; border-collapse: collapse; border: 1px solid #000;'><tr><td style='border: 1px solid #000; padding: 10px; background: #f2f2f2; font-weight:bold;'>기안자</td><td style='border: 1px solid #000; padding: 10px;'>{row['이름']}</td></tr><tr><td style='border: 1px solid #000; padding: 10px; background: #f2f2f2; font-weight:bold;'>제목</td><td style='border: 1px solid #000; padding: 10px;'>{row['제목']}</td></tr><tr><td colspan='2' style='border: 1px solid #000; padding: 30px; height: 200px; vertical-align: top;'>{row['내용'].replace('|', '<br>')}</td></tr></table></div>"
+        st.markdown(doc_body, unsafe_allow_html=True)
+        
+        if st.button("📄 기안서 출력", key=f"prt_{key}_{row['결재ID']}"):
+            safe_body = doc_body.replace("'", "\\'").replace("\n", "")
+            components.html(f"<script>var pwin = window.open('', '_blank'); pwin.document.write('<html><body>{safe_body}</body></html>'); pwin.document.close(); setTimeout(function(){{ pwin.print(); pwin.close(); }}, 500);</script>", height=0)
+
 # --- 3. 디자인 설정 ---
 st.set_page_config(page_title="Didimdol HR", page_icon="logo.png", layout="wide")
+METRICS.begin_run()
 if 'user_info' not in st.session_state: st.session_state['user_info'] = None
 
 logo_b64 = get_base64_img("logo.png")
@@ -191,11 +182,11 @@ if st.session_state['user_info'] is None:
             u_id = st.text_input("아이디", key="login_id")
             u_pw = st.text_input("비밀번호", type="password", key="login_pw")
             if st.button("로그인", type="primary", use_container_width=True):
-                users = fetch("User_List")
-                if not users.empty and '아이디' in users.columns:
-                    match = users[(users['아이디'].astype(str) == u_id) & (users['비밀번호'].astype(str) == u_pw)]
-                    if not match.empty:
-                        st.session_state['user_info'] = match.iloc[0].to_dict(); st.rerun()
+                users = user_directory()
+                if len(users):
+                    match = users.authenticate(u_id, u_pw)
+                    if match is not None:
+                        st.session_state['user_info'] = match; st.rerun()
                     else: st.error("아이디 또는 비밀번호가 틀립니다.")
                 else: st.error("데이터 로딩 실패")
         with t_j:
@@ -204,12 +195,12 @@ if st.session_state['user_info'] is None:
                 j_b, j_c, j_i, j_p, j_n = st.text_input("사업자번호"), st.text_input("사업장명"), st.text_input("ID"), st.text_input("PW", type="password"), st.text_input("성함")
                 if st.form_submit_button("가입신청", use_container_width=True):
                     try:
-                        get_engine().open_by_key(SPREADSHEET_ID).worksheet("User_List").append_row([j_b, j_c, j_i, j_p, j_n, 'Manager', '8', '스타터', '정규직', '40'])
+                        get_writer().append_row("User_List", [j_b, j_c, j_i, j_p, j_n, 'Manager', '8', '스타터', '정규직', '40'])
                         st.success("가입 신청이 완료되었습니다.")
                     except: st.error("가입 신청 중 오류 발생")
 else:
     u = st.session_state['user_info']
-    db = get_engine() 
+    db = get_writer() 
     
     st.sidebar.markdown(logo_html, unsafe_allow_html=True)
     st.sidebar.write(f"**{u.get('사업장명','')}**")
@@ -217,24 +208,26 @@ else:
     
     st.sidebar.divider()
     
-    recs = fetch("Attendance_Records")
+    biz = str(u['사업자번호'])
+    get_archive_job()
+    recs = tenant_frame("Attendance_Records", biz)
+    att_idx = tenant_index("Attendance_Records", biz, build_attendance_index)
     today_dt = date.today()
     d_str = today_dt.strftime("%Y-%m-%d")
     
     it, ot = "--:--", "--:--"
     has_in, has_out = False, False
     
-    if not recs.empty and '아이디' in recs.columns:
-        my_t = recs[(recs['아이디'].astype(str) == str(u['아이디'])) & (recs['일시'].str.contains(d_str))]
-        if not my_t.empty:
-            in_recs = my_t[my_t['구분'].str.contains('출근')]
-            out_recs = my_t[my_t['구분'].str.contains('퇴근')]
-            if not in_recs.empty:
-                it = in_recs.iloc[-1]['일시'].split(" ")[1]
-                has_in = True
-            if not out_recs.empty:
-                ot = out_recs.iloc[-1]['일시'].split(" ")[1]
-                has_out = True
+    my_t = att_idx.get(u['사업자번호'], u['아이디'], d_str)
+    # 저널에만 있는(시트 전송 전) 출퇴근도 바로 표시
+    pend = get_journal().pending(u['사업자번호'], u['아이디'], d_str) if get_journal() is not None else {}
+    in_at, out_at = my_t.in_at or pend.get("출근"), my_t.out_at or pend.get("퇴근")
+    if in_at:
+        it = hms(in_at) + ("" if my_t.in_at else " ⏳")
+        has_in = True
+    if out_at:
+        ot = hms(out_at) + ("" if my_t.out_at else " ⏳")
+        has_out = True
                 
     st.sidebar.write(f"🕒 출근: **{it}**")
     st.sidebar.write(f"🕒 퇴근: **{ot}**")
@@ -243,13 +236,13 @@ else:
         if st.sidebar.button("출근하기", type="primary", use_container_width=True):
             now_kst = datetime.now() + timedelta(hours=9)
             now_t = now_kst.strftime("%H:%M:%S")
-            db.open_by_key(SPREADSHEET_ID).worksheet("Attendance_Records").append_row([str(u['사업자번호']), u['아이디'], u['이름'], f"{d_str} {now_t}", "출근", "", ""])
+            record_punch([str(u['사업자번호']), u['아이디'], u['이름'], f"{d_str} {now_t}", "출근", "", ""])
             st.rerun()
     elif not has_out:
         if st.sidebar.button("퇴근하기", type="primary", use_container_width=True):
             now_kst = datetime.now() + timedelta(hours=9)
             now_t = now_kst.strftime("%H:%M:%S")
-            db.open_by_key(SPREADSHEET_ID).worksheet("Attendance_Records").append_row([str(u['사업자번호']), u['아이디'], u['이름'], f"{d_str} {now_t}", "퇴근", "", ""])
+            record_punch([str(u['사업자번호']), u['아이디'], u['이름'], f"{d_str} {now_t}", "퇴근", "", ""])
             st.rerun()
     
     m_list = ["🏠 홈 (일정공유)", "📝 전자결재", "👥 직원 관리", "📊 근무 관리", "📂 데이터 추출"] if u['권한'] == 'Manager' else ["🏠 홈 (일정공유)", "📝 전자결재", "📋 나의 기록 확인"]
@@ -259,7 +252,8 @@ else:
     if "홈" in menu:
         st.header(f"반갑습니다, {u['이름']}님.")
         # [수정] 일정 데이터 가져오기 및 날짜 비교 로직 강화
-        sch = fetch("Schedules")
+        # 일정은 Schedules 가 바뀔 때만 파싱/그룹화하고 칸마다 사전 조회
+        my_sch = month_schedules(tenant_index("Schedules", biz, build_schedule_index), biz, today_dt.year, today_dt.month)
         cal = calendar.monthcalendar(today_dt.year, today_dt.month)
         cols_h = st.columns(7)
         for i, d in enumerate(["월","화","수","목","금","토","일"]): cols_h[i].markdown(f"<p style='text-align:center; font-weight:bold;'>{d}</p>", unsafe_allow_html=True)
@@ -271,138 +265,79 @@ else:
                     with cols[i]:
                         bg = "#e7f3ff" if curr_date == d_str else "transparent"
                         st.markdown(f"<div style='text-align:center; background-color:{bg}; border:1px solid #eee;'><b>{day}</b></div>", unsafe_allow_html=True)
-                        if not sch.empty:
-                            # 2026-1-10 과 2026-01-10 비교를 위해 replace로 단순화
-                            my_sch = sch[(sch.get('사업자번호','').astype(str) == str(u['사업자번호']))]
-                            if not my_sch.empty:
-                                for _, row in my_sch.iterrows():
-                                    # DB 날짜와 달력 날짜를 둘 다 정제해서 비교
-                                    db_date = str(row.get('날짜','')).strip().replace('-0', '-')
-                                    cal_date = curr_date.replace('-0', '-')
-                                    if db_date == cal_date:
-                                        with st.popover(row['이름'], use_container_width=True): st.write(f"📌 {row['내용']}")
+                        for name, content in my_sch.get(day, []):
+                            with st.popover(name, use_container_width=True): st.write(f"📌 {content}")
                 else: cols[i].write("")
                 
     elif menu == "📝 전자결재": run_approval_system(u, db)
     
     elif menu == "📊 근무 관리":
         st.header("📊 전사 월간 근태 모니터링")
-        # [설명] 근로 기준 시간 설정 (7시간 40분 ~ 8시간 20분)
-        MIN_WORK_MINUTES = 7 * 60 + 40  # 460분
-        MAX_WORK_MINUTES = 8 * 60 + 20  # 500분
-
-        udf = fetch(1); staffs = udf[udf.get('사업자번호','') == str(u['사업자번호'])]
-        cal_obj = calendar.monthcalendar(today_dt.year, today_dt.month)
+        staffs = tenant_frame("User_List", biz)
+        # 한 달치 (직원 x 일) 실 근로시간을 한 번에 계산해 두고 표 하나로 그린다
+        work = month_table(att_idx, u['사업자번호'], today_dt.year, today_dt.month, staffs, today=today_dt)
         
-        cols_h = st.columns(7)
-        for i, dn in enumerate(["월","화","수","목","금","토","일"]):
-            cols_h[i].markdown(f"<p style='text-align:center; font-weight:bold;'>{dn}</p>", unsafe_allow_html=True)
+        # 직원 x 일마다 팝오버/폼을 만들지 않도록 팀(또는 직원 묶음) x 주 단위 페이지로 나눠서 표시
+        s_pages, w_pages = staff_pages(staffs), week_pages(today_dt.year, today_dt.month)
+        pc1, pc2 = st.columns(2)
+        s_key = pc1.selectbox("팀" if TEAM_COL in staffs.columns else "직원", list(s_pages))
+        w_key = pc2.selectbox("기간", ["이번 달 전체"] + list(w_pages))
+        page_staffs = s_pages[s_key]
+        days = w_pages.get(w_key, [d for wd in w_pages.values() for d in wd])
+        grid = month_grid(work, page_staffs, today_dt.year, today_dt.month, days)
+        
+        st.caption("칸을 선택하면 해당 직원/날짜의 출퇴근 기록을 수정할 수 있습니다. 🚨 = 근로시간 미달/초과")
+        ev = st.dataframe(grid_style(grid), use_container_width=True, hide_index=True, on_select="rerun", selection_mode="single-cell", key=f"wg_{s_key}_{w_key}")
+        
+        sel = [c for c in ev.selection.cells if c[1] != "이름"]
+        if sel:
+            # 선택한 칸 하나에 대해서만 수정 폼 생성
+            s = page_staffs.iloc[sel[0][0]]
+            d_str = f"{today_dt.year}-{today_dt.month:02d}-{int(sel[0][1].split('(')[0]):02d}"
+            s_rec = att_idx.get(u['사업자번호'], s['아이디'], d_str)
+            # 시각을 읽을 수 없는 기록은 원문 시각을 그대로 보여 주고 수정 폼에 채운다
+            ir = hms(s_rec.in_at) if s_rec.in_at else (s_rec.in_text or "")
+            oraw = hms(s_rec.out_at) if s_rec.out_at else (s_rec.out_text or "")
             
-        for week in cal_obj:
-            cols = st.columns(7)
-            for i, day in enumerate(week):
-                if day != 0:
-                    d_str = f"{today_dt.year}-{today_dt.month:02d}-{day:02d}"
-                    with cols[i]:
-                        st.markdown(f"<div style='text-align:center; color:gray;'>{day}</div>", unsafe_allow_html=True)
-                        day_recs = recs[recs.get('일시','').str.contains(d_str)]
+            st.markdown(f"#### ✏️ {s['이름']} · {d_str}")
+            w = work[(work["아이디"] == str(s['아이디'])) & (work["날짜"] == d_str)]
+            if not w.empty and w.iloc[0]['상태'] in WARN_STATUSES + ("정상",):
+                # 실 근로시간/상태 (휴게시간 차감, 미달/초과 판정은 work_hours.month_table)
+                text_color = "#e02424" if w.iloc[0]['경고'] else "black" # 붉은색
+                st.markdown(f"<span style='color:{text_color}; font-weight:bold; font-size:14px;'>실 근로: {fmt_minutes(w.iloc[0]['실근로분'])} ({w.iloc[0]['상태']})</span>", unsafe_allow_html=True)
+            elif not w.empty: st.markdown(f"<span style='color:gray;'>{w.iloc[0]['상태']}</span>", unsafe_allow_html=True)
+            st.caption(f"출근: {ir or '--:--'} | 퇴근: {oraw or '--:--'}")
+            
+            with st.form(f"fm_{s['아이디']}_{d_str}"):
+                ns = datetime.now().second
+                ni = st.text_input("출근 수정", value=ir)
+                no = st.text_input("퇴근 수정", value=oraw)
+                rs = st.text_area("- 수정 사유 (필수)")
+                
+                if st.form_submit_button("최종 저장"):
+                    if rs and ni.strip() and no.strip():
+                        fi, fo = smart_time_parser(ni, ns), smart_time_parser(no, ns)
                         
-                        for _, s in staffs.iterrows():
-                            s_recs = day_recs[day_recs['이름'] == s['이름']]
-                            if not s_recs.empty:
-                                itr, otr = s_recs[s_recs['구분'].str.contains('출근')], s_recs[s_recs['구분'].str.contains('퇴근')]
-                                # 데이터가 있으면 가져오기
-                                ir = (itr.iloc[-1]['일시'] if not itr.empty else None)
-                                oraw = (otr.iloc[-1]['일시'] if not otr.empty else None)
+                        with db.batch() as wb:
+                            if s_rec.fix_in_row is not None: 
+                                # 기존 수정 행 업데이트
+                                wb.update_cell(0, s_rec.fix_in_row + 2, 4, f"{d_str} {fi}")
                                 
-                                if ir and oraw:
-                                    # --- [복구] 실 근로시간 계산 및 색상 로직 시작 ---
-                                    time_display = "계산중"
-                                    is_red = False
-                                    
-                                    try:
-                                        # 1. 시간 파싱 (형식: YYYY-MM-DD HH:MM:SS)
-                                        t_start = datetime.strptime(ir, "%Y-%m-%d %H:%M:%S")
-                                        t_end = datetime.strptime(oraw, "%Y-%m-%d %H:%M:%S")
-                                        
-                                        # 2. 총 근무시간(분 단위) 계산
-                                        total_diff = t_end - t_start
-                                        total_minutes = total_diff.total_seconds() / 60
-                                        
-                                        # 3. 법정 휴게시간 차감 (4시간 이상 30분, 8시간 이상 1시간)
-                                        deduction = 0
-                                        if total_minutes >= 480: # 8시간 이상
-                                            deduction = 60
-                                        elif total_minutes >= 240: # 4시간 이상
-                                            deduction = 30
-                                            
-                                        net_minutes = total_minutes - deduction
-                                        
-                                        # 4. 시간/분 변환
-                                        net_h = int(net_minutes // 60)
-                                        net_m = int(net_minutes % 60)
-                                        
-                                        # 5. 상태 판단 (유연근무: 7시간 40분 ~ 8시간 20분)
-                                        status_txt = ""
-                                        text_color = "black"
-                                        
-                                        if net_minutes < MIN_WORK_MINUTES:
-                                            status_txt = "(미달)"
-                                            text_color = "#e02424" # 붉은색
-                                            is_red = True
-                                        elif net_minutes > MAX_WORK_MINUTES:
-                                            status_txt = "(초과)"
-                                            text_color = "#e02424" # 붉은색
-                                            is_red = True
-                                        else:
-                                            status_txt = "(정상)"
-                                            text_color = "black"
-                                            
-                                        msg_html = f"<span style='color:{text_color}; font-weight:bold; font-size:14px;'>실 근로: {net_h}시간 {net_m}분 {status_txt}</span>"
-                                        
-                                    except Exception:
-                                        msg_html = "<span style='color:gray;'>시간 계산 오류</span>"
-                                    # --- [복구] 로직 끝 ---
-
-                                    # 팝오버 버튼 (경고 시 🚨 표시 추가하여 밖에서도 인지 가능하게 수정)
-                                    btn_label = f"{s['이름']} {'🚨' if is_red else ''}"
-                                    
-                                    with st.popover(btn_label, use_container_width=True):
-                                        # 상단에 계산된 근로시간 표시
-                                        st.markdown(msg_html, unsafe_allow_html=True)
-                                        st.caption(f"출근: {ir.split(' ')[1]} | 퇴근: {oraw.split(' ')[1]}")
-                                        
-                                        with st.form(f"fm_{s['이름']}_{day}"):
-                                            ns = datetime.now().second
-                                            ni = st.text_input("출근 수정", value=ir.split(' ')[1])
-                                            no = st.text_input("퇴근 수정", value=oraw.split(' ')[1])
-                                            rs = st.text_area("- 수정 사유 (필수)")
-                                            
-                                            if st.form_submit_button("최종 저장"):
-                                                if rs:
-                                                    fi, fo = smart_time_parser(ni, ns), smart_time_parser(no, ns)
-                                                    sheet0 = db.get_worksheet(0)
-                                                    df_t = fetch(0)
-                                                    # 기존 수정 내역 확인 로직
-                                                    in_m = (df_t['아이디'] == s['아이디']) & (df_t['일시'].str.contains(d_str)) & (df_t['구분'] == "출근(수정)")
-                                                    
-                                                    if in_m.any(): 
-                                                        # 기존 수정 행 업데이트
-                                                        row_idx = df_t.index[in_m][0] + 2
-                                                        sheet0.update_cell(row_idx, 4, f"{d_str} {fi}")
-                                                        
-                                                    # 수정 이력 새로 쌓기 (안전)
-                                                    sheet0.append_row([str(u['사업자번호']), s['아이디'], s['이름'], f"{d_str} {fi}", "출근(수정)", rs, ""])
-                                                    sheet0.append_row([str(u['사업자번호']), s['아이디'], s['이름'], f"{d_str} {fo}", "퇴근(수정)", rs, ""])
-                                                    
-                                                    st.success("저장됨"); st.cache_data.clear(); st.rerun()
-                                else: cols[i].write("")
+                            # 수정 이력 새로 쌓기 (안전)
+                            wb.append_row(0, [str(u['사업자번호']), s['아이디'], s['이름'], f"{d_str} {fi}", "출근(수정)", rs, ""])
+                            wb.append_row(0, [str(u['사업자번호']), s['아이디'], s['이름'], f"{d_str} {fo}", "퇴근(수정)", rs, ""])
+                        
+                        st.success("저장됨"); st.rerun()
+                    else: st.warning("출근/퇴근 시각과 수정 사유를 모두 입력하세요.")
+        
+        st.divider()
+        st.subheader("🧾 월간 근무 요약")
+        st.dataframe(month_summary(work), use_container_width=True, hide_index=True)
                                     
     elif menu == "👥 직원 관리":
         st.header("👥 직원 정보 관리")
-        ms = fetch("User_List")
+        ms = tenant_frame("User_List", biz)
         if not ms.empty:
-            ms = ms[ms['사업자번호'].astype(str) == str(u['사업자번호'])]
             st.dataframe(ms[['이름', '아이디', '권한', '고용형태']], use_container_width=True, hide_index=True)
             
             st.divider()
@@ -416,24 +351,46 @@ else:
                     new_type = c2.selectbox("고용형태", ["정규직", "계약직", "아르바이트"], index=["정규직", "계약직", "아르바이트"].index(target_row.get('고용형태', '정규직')))
                     if st.form_submit_button("정보 업데이트"):
                         try:
-                            ws = db.open_by_key(SPREADSHEET_ID).worksheet("User_List")
-                            cell = ws.find(target_name)
-                            ws.update_cell(cell.row, 6, new_pos)
-                            ws.update_cell(cell.row, 9, new_type)
-                            st.success("수정 완료"); st.cache_data.clear(); st.rerun()
+                            cell = db.sync.worksheet("User_List").find(target_name)
+                            db.update_cells("User_List", cell.row, {6: new_pos, 9: new_type})
+                            st.success("수정 완료"); st.rerun()
                         except Exception as e: st.error(f"수정 실패: {e}")
 
     elif menu == "📂 데이터 추출":
         st.header("📂 증빙 데이터 엑셀 추출")
-        if st.button("📄 엑셀 파일 생성"):
-            output = io.BytesIO()
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                recs[recs['사업자번호'].astype(str) == str(u['사업자번호'])].to_excel(writer, index=False, sheet_name='근태기록')
-                fetch("Schedules").to_excel(writer, index=False, sheet_name='일정')
-            st.download_button("다운로드", data=output.getvalue(), file_name=f"HR_Data_{date.today()}.xlsx")
+        c1, c2, c3 = st.columns(3)
+        ex_start = c1.date_input("시작일", value=today_dt.replace(day=1))
+        ex_end = c2.date_input("종료일", value=today_dt)
+        ex_fmt = EXPORT_FORMATS[c3.selectbox("파일 형식", list(EXPORT_FORMATS))]
+        if ex_start > ex_end: st.error("시작일이 종료일보다 늦습니다.")
+        else:
+            sch_df, staff_df = tenant_frame("Schedules", biz), tenant_frame("User_List", biz)
+            # 파일은 다운로드를 누를 때 별도 스레드에서 청크 단위로 생성 (화면 스크립트를 막지 않음)
+            def make_export():
+                # 보관된 달이 기간에 걸치면 합친 기록으로 인덱스를 새로 만든다
+                h_recs = history_frame(biz, ex_start, ex_end, hot=recs)
+                h_idx = att_idx if h_recs is recs else build_attendance_index(h_recs)
+                return build_export(ex_fmt, export_tables(h_recs, sch_df, h_idx, biz, ex_start, ex_end, staff_df))
+            st.download_button("📄 파일 생성 및 다운로드", data=make_export,
+                               file_name=export_file_name(ex_fmt, ex_start, ex_end))
             
     elif menu == "📋 나의 기록 확인":
         st.header("📋 나의 근태 기록")
-        if not recs.empty:
-            my_all = recs[recs['아이디'].astype(str) == str(u['아이디'])]
-            st.dataframe(my_all[['일시', '구분', '비고']], use_container_width=True, hide_index=True)
+        # 기본은 현재 시트에 남아 있는 달만, 더 이전 기간을 고르면 그 달의 보관 시트만 읽는다
+        c1, c2 = st.columns(2)
+        my_start = c1.date_input("시작일", value=hot_start(today_dt), key="my_start")
+        my_end = c2.date_input("종료일", value=today_dt, key="my_end")
+        if my_start > my_end: st.error("시작일이 종료일보다 늦습니다.")
+        else:
+            h_recs = history_frame(biz, my_start, my_end, hot=recs)
+            if not h_recs.empty:
+                if h_recs is recs: my_all = att_idx.user_frame(u['사업자번호'], u['아이디'])
+                else: my_all = h_recs[h_recs['아이디'].astype(str) == str(u['아이디'])]
+                my_all = filter_dates(my_all, '일시', my_start, my_end)
+                st.dataframe(my_all[['일시', '구분', '비고']], use_container_width=True, hide_index=True)
+
+# --- 5. 성능 계측 (st.rerun() 으로 중단된 실행은 기록하지 않음) ---
+if st.session_state['user_info'] is None: METRICS.end_run("로그인")
+else:
+    if u['권한'] == 'Manager' and metrics_panel_enabled(): render_metrics_panel()
+    METRICS.end_run(menu, biz=biz, user=u['아이디'])
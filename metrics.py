@@ -0,0 +1,216 @@
+# --- 성능 계측 ---
+# 구글 API 호출(횟수/지연/행 수/바이트), st.cache 적중률, 화면(메뉴)별 스크립트 실행 시간을 모은다.
+# 스크립트 실행 밖(백그라운드 갱신/플러시 스레드)의 호출은 시트별로 따로 모으고, 실행 로그에는 그 실행 동안의 백그라운드 호출을 함께 적는다.
+#  - instrument(client) : gspread 클라이언트를 감싸서 모든 API 호출을 기록
+#  - begin_run()/end_run(menu) : 한 번의 스크립트 실행(rerun) 단위로 집계해서 구조화 로그(JSON 한 줄) 출력
+#  - quota_usage() : 최근 60초 호출 수 (시트 API 할당량 확인용)
+import contextvars
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+# 구글 시트 API 기본 할당량 (프로젝트 기준 분당 요청 수)
+READ_QUOTA_PER_MIN = 300
+WRITE_QUOTA_PER_MIN = 300
+SIZE_SAMPLE = 64   # 큰 응답 크기 추정에 쓰는 항목 수
+
+READ_METHODS = {"get_all_values", "get_values", "get", "batch_get", "col_values", "find", "values_batch_get"}
+WRITE_METHODS = {"append_row", "append_rows", "update_cell", "batch_update", "values_batch_update", "add_worksheet"}
+META_METHODS = {"open_by_key", "worksheet", "get_worksheet", "worksheets"}
+API_METHODS = READ_METHODS | WRITE_METHODS | META_METHODS
+
+log = logging.getLogger("didimdol.metrics")
+if not log.handlers:
+    _h = logging.StreamHandler()
+    _h.setFormatter(logging.Formatter("%(message)s"))
+    log.addHandler(_h)
+    log.setLevel(logging.INFO)
+    log.propagate = False
+
+
+def _kind(op):
+    return "write" if op in WRITE_METHODS else "read"
+
+
+def _size(obj):
+    # 응답/요청 본문 크기 근사치 (셀 값의 UTF-8 바이트 합). 전체 시트 응답을 매번 직렬화하지 않도록
+    # 항목이 많으면 고르게 뽑은 SIZE_SAMPLE 개의 평균으로 추정한다
+    if isinstance(obj, (list, tuple)):
+        n = len(obj)
+        if n <= SIZE_SAMPLE: return sum(_size(v) for v in obj)
+        step = n / SIZE_SAMPLE
+        return int(sum(_size(obj[int(i * step)]) for i in range(SIZE_SAMPLE)) * step)
+    if isinstance(obj, dict): return sum(_size(v) for v in obj.values())
+    return len(str(obj).encode()) if obj is not None else 0
+
+
+class RunStats:
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.api_calls = 0
+        self.api_ms = 0.0
+        self.rows = 0
+        self.bytes = 0
+        self.by_sheet = {}   # 시트명 -> [호출, ms, 행, 바이트]
+        self.cache = {}      # 캐시 이름 -> [호출, 미적중]
+        self.bg_start = {}   # 실행 시작 시점의 시트별 백그라운드 누적 [호출, ms]
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.t0) * 1000
+
+    def as_dict(self):
+        return {
+            "ms": round(self.elapsed_ms(), 1),
+            "api_calls": self.api_calls,
+            "api_ms": round(self.api_ms, 1),
+            "rows": self.rows,
+            "bytes": self.bytes,
+            "by_sheet": {k: {"calls": v[0], "ms": round(v[1], 1), "rows": v[2], "bytes": v[3]} for k, v in self.by_sheet.items()},
+            "cache": {k: {"hit": v[0] - v[1], "miss": v[1]} for k, v in self.cache.items()},
+        }
+
+
+_current = contextvars.ContextVar("didimdol_run", default=None)
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.api_totals = {}    # (시트명, 메서드) -> [호출, ms, 행, 바이트, 오류, 백그라운드 호출]
+        self.bg_totals = {}     # 시트명 -> [호출, ms] (스크립트 실행 밖의 호출)
+        self.cache_totals = {}  # 캐시 이름 -> [호출, 미적중]
+        self.menu_totals = {}   # 메뉴 -> [실행 수, 합계 ms, 최대 ms]
+        self._recent = {"read": deque(), "write": deque()}
+
+    # --- 기록 ---
+    def api(self, sheet, op, seconds, rows=0, nbytes=0, error=None):
+        ms = seconds * 1000
+        sheet = "-" if sheet is None else str(sheet)
+        run = _current.get()
+        with self._lock:
+            t = self.api_totals.setdefault((sheet, op), [0, 0.0, 0, 0, 0, 0])
+            t[0] += 1; t[1] += ms; t[2] += rows; t[3] += nbytes; t[4] += 1 if error else 0
+            self._recent[_kind(op)].append(time.monotonic())
+            if run is None:
+                t[5] += 1
+                b = self.bg_totals.setdefault(sheet, [0, 0.0])
+                b[0] += 1; b[1] += ms
+        if run is not None:
+            run.api_calls += 1; run.api_ms += ms; run.rows += rows; run.bytes += nbytes
+            s = run.by_sheet.setdefault(sheet, [0, 0.0, 0, 0])
+            s[0] += 1; s[1] += ms; s[2] += rows; s[3] += nbytes
+
+    def cache_call(self, name, miss=False):
+        # 캐시 함수 호출(miss=False)과 실제 본문 실행(miss=True)을 따로 세면 적중 = 호출 - 미적중
+        i = 1 if miss else 0
+        with self._lock: self.cache_totals.setdefault(name, [0, 0])[i] += 1
+        run = _current.get()
+        if run is not None: run.cache.setdefault(name, [0, 0])[i] += 1
+
+    # --- 실행 단위 ---
+    def begin_run(self):
+        run = RunStats()
+        with self._lock: run.bg_start = {k: list(v) for k, v in self.bg_totals.items()}
+        _current.set(run)
+        return run
+
+    def current(self):
+        return _current.get() or RunStats()
+
+    def end_run(self, menu, **fields):
+        run = _current.get()
+        if run is None: return
+        _current.set(None)
+        info = run.as_dict()
+        info["background"] = self.background_since(run)
+        with self._lock:
+            m = self.menu_totals.setdefault(menu, [0, 0.0, 0.0])
+            m[0] += 1; m[1] += info["ms"]; m[2] = max(m[2], info["ms"])
+        log.info(json.dumps(dict(event="rerun", menu=menu, quota_60s=self.quota_usage(), **fields, **info), ensure_ascii=False))
+
+    # --- 조회 ---
+    def background_since(self, run):
+        # 실행이 시작된 뒤 백그라운드 스레드가 부른 API (다른 세션의 실행과 겹치는 구간은 양쪽에 모두 잡힌다)
+        out, calls, ms = {}, 0, 0.0
+        with self._lock:
+            for sheet, (c, t) in self.bg_totals.items():
+                c0, t0 = run.bg_start.get(sheet, (0, 0.0))
+                if c > c0:
+                    out[sheet] = {"calls": c - c0, "ms": round(t - t0, 1)}
+                    calls += c - c0; ms += t - t0
+        return {"api_calls": calls, "api_ms": round(ms, 1), "by_sheet": out}
+
+    def quota_usage(self):
+        now = time.monotonic()
+        with self._lock:
+            for q in self._recent.values():
+                while q and now - q[0] >= 60: q.popleft()
+            return {k: len(q) for k, q in self._recent.items()}
+
+    def sheet_table(self):
+        with self._lock:
+            return [{"시트": s, "메서드": op, "호출": v[0], "백그라운드": v[5], "평균 ms": round(v[1] / v[0], 1), "행": v[2], "KB": round(v[3] / 1024, 1), "오류": v[4]}
+                    for (s, op), v in sorted(self.api_totals.items())]
+
+    def menu_table(self):
+        with self._lock:
+            return [{"메뉴": k, "실행": v[0], "평균 ms": round(v[1] / v[0], 1), "최대 ms": round(v[2], 1)}
+                    for k, v in sorted(self.menu_totals.items())]
+
+    def cache_table(self):
+        with self._lock:
+            return [{"캐시": k, "적중": v[0] - v[1], "미적중": v[1]} for k, v in sorted(self.cache_totals.items())]
+
+
+METRICS = Metrics()
+
+
+class _Instrumented:
+    # gspread Client/Spreadsheet/Worksheet 를 감싸서 API 메서드 호출만 계측 (나머지 속성은 그대로 전달)
+    def __init__(self, target, sheet=None):
+        self._target = target
+        self._sheet = sheet
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if name not in API_METHODS or not callable(attr): return attr
+
+        def call(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                res = attr(*args, **kwargs)
+            except Exception as e:
+                METRICS.api(self._sheet, name, time.perf_counter() - t0, error=getattr(e, "code", type(e).__name__))
+                raise
+            elapsed = time.perf_counter() - t0
+            if name in WRITE_METHODS:
+                payload = args[0] if args else kwargs.get("values", kwargs.get("body"))
+                METRICS.api(self._write_sheet(name, payload), name, elapsed, _write_rows(name, payload), _size(payload))
+            elif name in READ_METHODS and isinstance(res, list):
+                METRICS.api(self._sheet, name, elapsed, len(res), _size(res))
+            elif name in ("worksheet", "get_worksheet") and res is not None:
+                METRICS.api(res.title, name, elapsed)
+                return _Instrumented(res, res.title)
+            else:
+                METRICS.api(self._sheet, name, elapsed)
+            if name == "open_by_key": return _Instrumented(res)
+            return res
+        return call
+
+    def _write_sheet(self, name, payload):
+        # values_batch_update 는 스프레드시트 단위라 범위에 적힌 시트명으로 기록
+        if name != "values_batch_update" or not isinstance(payload, dict): return self._sheet
+        titles = {d["range"].rsplit("!", 1)[0].strip("'") for d in payload.get("data", [])}
+        return ",".join(sorted(titles)) or None
+
+
+def _write_rows(name, payload):
+    if name in ("append_row", "update_cell"): return 1
+    if isinstance(payload, dict): return len(payload.get("data", []))
+    return len(payload) if isinstance(payload, list) else 0
+
+
+def instrument(client):
+    return _Instrumented(client) if client is not None else None
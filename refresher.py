@@ -0,0 +1,71 @@
+# --- 백그라운드 시트 갱신 (stale-while-revalidate) ---
+# 화면에서는 마지막으로 받은 사본을 바로 쓰고, 구글 API 확인은 작업 스레드가 한다.
+#  - 최근 HOT_SEC 안에 조회된 시트만 REFRESH_SEC 주기로 확인
+#  - 같은 시트 갱신 요청이 겹치면 진행 중인 작업 하나를 공유 (API 호출 1번)
+#  - API 오류 중에도 마지막 사본을 계속 반환 (사본이 아직 없을 때만 오류)
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+REFRESH_SEC = 5      # 백그라운드 확인 주기 (시트 4개 기준 분당 50회 안팎 -> 읽기 할당량 300/분 이내)
+HOT_SEC = 120        # 이 시간 동안 조회가 없던 시트는 갱신 중단
+MAX_WORKERS = 2
+COLD_WAIT_SEC = 30   # 사본이 없을 때 첫 동기화를 기다리는 최대 시간
+
+log = logging.getLogger("didimdol.refresher")
+
+
+class SheetRefresher:
+    def __init__(self, sync, interval=REFRESH_SEC, hot_sec=HOT_SEC, max_workers=MAX_WORKERS):
+        self.sync = sync
+        self.interval = interval
+        self.hot_sec = hot_sec
+        self.errors = {}      # 시트명 -> (실패 시각, 예외)  마지막 갱신이 실패한 시트만
+        self._hot = {}        # 시트명 -> 마지막 조회 시각
+        self._inflight = {}   # 시트명 -> 진행 중인 Future
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="sheet-refresh")
+        self._ticker = threading.Thread(target=self._loop, name="sheet-refresh-ticker", daemon=True)
+        self._ticker.start()
+
+    def frame(self, sheet):
+        # 마지막 사본을 바로 반환하고, 확인한 지 interval 이 지났으면 백그라운드 갱신만 예약
+        title = self.sync.worksheet(sheet).title
+        self._hot[title] = time.time()
+        if self.sync.age(title) == float("inf"):
+            self.refresh(title).result(timeout=COLD_WAIT_SEC)
+        elif self.sync.age(title) >= self.interval:
+            self.refresh(title)
+        return self.sync.snapshot(title)[1]
+
+    def refresh(self, sheet):
+        title = self.sync.worksheet(sheet).title
+        with self._lock:
+            fut = self._inflight.get(title)
+            if fut is None or fut.done():
+                fut = self._inflight[title] = self._pool.submit(self._run, title)
+            return fut
+
+    def close(self):
+        self._stop.set()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, title):
+        try:
+            self.sync.frame(title)
+        except Exception as e:
+            if title not in self.errors: log.warning("시트 갱신 실패, 마지막 사본 유지: %s (%s)", title, e)
+            self.errors[title] = (time.time(), e)
+            raise
+        self.errors.pop(title, None)
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            now = time.time()
+            for title, seen in list(self._hot.items()):
+                if now - seen > self.hot_sec:
+                    self._hot.pop(title, None)
+                elif self.sync.age(title) >= self.interval:
+                    self.refresh(title)
@@ -0,0 +1,25 @@
+# --- 일정 달력 인덱스 ---
+# Schedules 시트를 한 번만 실제 날짜로 파싱해서 (사업자번호, 연, 월) -> {일: [(이름, 내용), ...]} 로 묶는다.
+# 홈 달력은 칸마다 전체 일정을 훑지 않고 사전 조회만 한다.
+import pandas as pd
+
+from schema import times
+
+
+def build_schedule_index(sch):
+    idx = {}
+    if sch.empty or '날짜' not in sch.columns: return idx
+    # 날짜는 schema 에서 이미 datetime64 (2026-1-10 / 2026-01-10 모두 같은 날짜)
+    dates = times(sch['날짜'])
+    ok = dates.notna().to_numpy()
+    biz = sch.get('사업자번호', pd.Series("", index=sch.index)).astype(str).to_numpy()[ok]
+    names = sch.get('이름', pd.Series("", index=sch.index)).to_numpy()[ok]
+    contents = sch.get('내용', pd.Series("", index=sch.index)).to_numpy()[ok]
+    dates = dates[ok]
+    for b, y, m, d, name, content in zip(biz, dates.dt.year, dates.dt.month, dates.dt.day, names, contents):
+        idx.setdefault((b, int(y), int(m)), {}).setdefault(int(d), []).append((name, content))
+    return idx
+
+
+def month_schedules(idx, biz, year, month):
+    return idx.get((str(biz), year, month), {})
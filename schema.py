@@ -0,0 +1,189 @@
+# --- 시트별 열 타입 ---
+# 시트 사본을 만들 때 한 번만 타입을 맞춰 두면, 화면/인덱스에서는 문자열을 다시 파싱하지 않고 벡터 비교만 한다.
+#  - CAT  : 값 종류가 적은 열 (사업자번호, 아이디, 구분, 상태 ...) -> category (행마다 문자열 대신 정수 코드)
+#  - TIME : 일시 -> datetime64 (형식이 다른 값도 최대한 파싱). 끝내 읽을 수 없는 값이 있으면 그 칸만 원문 문자열로 남긴
+#           object 열이 된다 (근태 화면이 '오류' 로 표시하고 수정 폼에 원문을 채울 수 있도록)
+#  - DATE : 날짜 -> datetime64 (자정)
+#  - LIST : "a,b" -> ("a", "b") 튜플 (결재자ID)
+#  - SECRET : 비밀번호 -> 행마다 무작위 솔트를 붙인 해시 "솔트$해시" (사본/파티션/캐시 어디에도 원문을 남기지 않음)
+#             시트가 바뀔 때마다 전체 사용자를 다시 해시하므로 느린 KDF 대신 blake2b 를 쓴다.
+# 스키마에 없는 열과 시트는 문자열 그대로 둔다.
+import hashlib
+import hmac
+import os
+import re
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+CAT, TIME, DATE, LIST, SECRET = "category", "time", "date", "list", "secret"
+TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+_DATE_PREFIX = re.compile(r"^\s*(\d{4})[-./](\d{1,2})[-./](\d{1,2})")
+
+SCHEMAS = {
+    "Attendance_Records": {"사업자번호": CAT, "아이디": CAT, "이름": CAT, "일시": TIME, "구분": CAT},
+    "Schedules": {"사업자번호": CAT, "날짜": DATE, "이름": CAT},
+    "User_List": {"사업자번호": CAT, "사업장명": CAT, "비밀번호": SECRET, "권한": CAT, "요금제": CAT, "고용형태": CAT},
+    "결재데이터": {"사업자번호": CAT, "기안자ID": CAT, "이름": CAT, "결재유형": CAT, "상태": CAT, "결재자ID": LIST},
+}
+
+
+def schema_of(title):
+    # 월별 보관 시트(Attendance_Records_2026-08)는 원본 시트와 같은 스키마
+    if title in SCHEMAS: return SCHEMAS[title]
+    base = title.rsplit("_", 1)[0]
+    return SCHEMAS.get(base) if base != title else None
+
+
+def times(s):
+    # 문자열/일시 열 -> datetime64. "2026-1-10 9:00" 같은 표기는 느린 경로로 한 번 더 시도
+    if pd.api.types.is_datetime64_any_dtype(s): return s
+    if s.dtype == object:
+        # 원문이 섞인 TIME 열: Timestamp 칸은 그대로 쓰고, 문자열 칸만 다시 파싱
+        text = s.map(lambda v: isinstance(v, str)).to_numpy(dtype=bool)
+        if not text.all():
+            t = pd.to_datetime(s.mask(text), errors="coerce")
+            if text.any(): t[text] = times(s[text].astype(str))
+            return t
+    s = s.astype(str).str.strip()
+    t = pd.to_datetime(s, format=TS_FORMAT, errors="coerce")
+    retry = t.isna() & (s != "")
+    if retry.any(): t[retry] = pd.to_datetime(s[retry], format="mixed", errors="coerce")
+    return t
+
+
+def unreadable(s, t=None):
+    # 값은 있는데 일시로 읽을 수 없는 칸
+    if pd.api.types.is_datetime64_any_dtype(s): return pd.Series(False, index=s.index)
+    t = times(s) if t is None else t
+    if s.dtype == object: text = s.map(lambda v: isinstance(v, str) and v.strip() != "").astype(bool)
+    else: text = s.astype(str).str.strip() != ""
+    return t.isna() & text
+
+
+def days_of(s, t=None):
+    # 일시 열 -> 그 날 자정. 시각을 읽을 수 없는 값은 앞의 날짜 부분으로 (날짜도 없으면 NaT)
+    t = times(s) if t is None else t
+    d = t.dt.normalize()
+    bad = unreadable(s, t)
+    if bad.any():
+        m = s[bad].astype(str).str.extract(_DATE_PREFIX).dropna()
+        if not m.empty:
+            m.columns = ["year", "month", "day"]
+            d[m.index] = pd.to_datetime(m.astype(int), errors="coerce")
+    return d
+
+
+def _keep_raw(s, t):
+    bad = unreadable(s, t)
+    if not bad.any(): return t
+    out = t.astype(object)
+    out[bad] = s[bad].astype(str).str.strip()
+    return out
+
+
+def split_ids(v):
+    return tuple(x.strip() for x in str(v).split(",") if x.strip())
+
+
+_FINGERPRINT_KEY = os.urandom(32)   # 프로세스마다 새로 만드는 키 (변경 확인용 해시가 프로세스 밖에서 쓸모없도록)
+
+
+def hash_secret(v):
+    salt = os.urandom(16)
+    return salt.hex() + "$" + hashlib.blake2b(str(v).encode(), salt=salt, digest_size=32).hexdigest()
+
+
+def check_secret(stored, v):
+    # hash_secret() 으로 저장한 값과 입력이 같은지 (형식이 다르면 False)
+    salt, _, digest = str(stored).partition("$")
+    try:
+        salt = bytes.fromhex(salt)
+    except ValueError:
+        return False
+    if len(salt) != 16: return False
+    return hmac.compare_digest(digest, hashlib.blake2b(str(v).encode(), salt=salt, digest_size=32).hexdigest())
+
+
+def fingerprint(v):
+    # 같은 값이면 같은 해시 (SheetSync 변경 확인 열에 비밀번호 원문 대신 보관)
+    return hashlib.blake2b(str(v).encode(), key=_FINGERPRINT_KEY, digest_size=16).hexdigest()
+
+
+def is_secret(title, col):
+    return (schema_of(title) or {}).get(col) == SECRET
+
+
+def _convert(kind, s):
+    if kind == CAT: return s.astype(str).astype("category")
+    if kind == TIME: return _keep_raw(s, times(s))
+    if kind == DATE: return times(s).dt.normalize()
+    if kind == LIST: return pd.Series([split_ids(v) for v in s], index=s.index, dtype=object)
+    if kind == SECRET: return pd.Series([hash_secret(v) for v in s], index=s.index, dtype=object)
+    return s
+
+
+def typed(title, df):
+    schema = schema_of(title)
+    if not schema or df.empty: return df
+    df = df.copy()
+    for col, kind in schema.items():
+        if col in df.columns: df[col] = _convert(kind, df[col])
+    return df
+
+
+def concat_rows(old, new):
+    # 사본 끝에 새 행을 붙인다. category 열은 기존 코드를 유지하고 새 값만 범주에 추가
+    # (헤더가 비어 있는 열이 여러 개일 수 있어서 열 이름 대신 위치로 다룬다)
+    if old.empty: return new.reset_index(drop=True)
+    cols = {}
+    for i in range(old.shape[1]):
+        a, b = old.iloc[:, i], new.iloc[:, i]
+        if isinstance(a.dtype, pd.CategoricalDtype) and isinstance(b.dtype, pd.CategoricalDtype):
+            cols[i] = union_categoricals([a, b])
+        else:
+            cols[i] = pd.concat([a, b], ignore_index=True)
+    out = pd.DataFrame(cols)
+    out.columns = old.columns
+    return out
+
+
+def prune_categories(df):
+    # 잘라낸 행에 없는 범주를 버린다 (사업장 파티션에 다른 사업장 값이 범주 목록으로 남지 않도록)
+    cats = [i for i, t in enumerate(df.dtypes) if isinstance(t, pd.CategoricalDtype)]
+    if not cats: return df
+    cols = {i: df.iloc[:, i].cat.remove_unused_categories() if i in cats else df.iloc[:, i] for i in range(df.shape[1])}
+    out = pd.DataFrame(cols, index=df.index)
+    out.columns = df.columns
+    return out
+
+
+def set_value(title, df, pos, i, value):
+    # pos 행, i 번째 열 셀 하나를 열 타입에 맞게 바꿔서 반영 (df 는 호출하는 쪽에서 복사본)
+    col = df.columns[i]
+    kind = (schema_of(title) or {}).get(col)
+    value = str(value)
+    if kind == CAT:
+        if value not in df.iloc[:, i].cat.categories: df[col] = df[col].cat.add_categories([value])
+    elif kind in (TIME, DATE):
+        raw, value = value.strip(), times(pd.Series([value])).iloc[0]
+        if kind == DATE: value = value.normalize()
+        elif pd.isna(value) and raw:
+            # 읽을 수 없는 일시는 원문으로 (datetime64 열이면 object 로 바꿔서)
+            if df.iloc[:, i].dtype != object: df.isetitem(i, df.iloc[:, i].astype(object))
+            value = raw
+    elif kind == LIST:
+        value = split_ids(value)
+    elif kind == SECRET:
+        value = hash_secret(value)
+    df.iat[pos, i] = value
+
+
+def contains(s, pat):
+    # str.contains 를 category 열에서는 범주 수만큼만 계산
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        hit = np.asarray(s.cat.categories.astype(str).str.contains(pat, regex=False), dtype=bool)
+        codes = s.cat.codes.to_numpy()
+        return pd.Series((codes >= 0) & hit[codes], index=s.index)
+    return s.astype(str).str.contains(pat, regex=False)
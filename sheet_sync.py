@@ -0,0 +1,282 @@
+# --- 시트 증분 동기화 ---
+# 워크시트별 로컬 사본을 유지하고, 매번 get_all_values() 로 전체를 받는 대신
+#  - 행 추가만 일어나는 시트는 마지막으로 읽은 행 이후만 가져오고
+#  - 셀 수정이 일어나는 시트는 변경 확인 열(SIGNATURE_COLUMNS)의 값이 바뀐 경우에만 다시 받는다.
+import hashlib
+import re
+import threading
+import time
+
+import pandas as pd
+
+from schema import typed, concat_rows, set_value, fingerprint, is_secret
+
+# 행 추가만 일어나는 시트 (셀 수정은 patch_local() 로 사본에 바로 반영하고, 시트에서 직접 고친 내용은 FULL_RESYNC_SEC 주기로 따라간다)
+APPEND_ONLY_SHEETS = {"Attendance_Records", "Schedules"}
+# 셀 수정이 일어나는 시트는 이 열들만 받아서 (행 수 + 값 해시) 로 변경을 확인한다.
+# 스프레드시트 전체 수정 시각과 달리 다른 시트의 쓰기(출퇴근 기록 등)로는 다시 받지 않는다.
+# 여기 없는 열을 시트에서 직접 고친 경우는 FULL_RESYNC_SEC 주기의 전체 동기화로 따라간다. (없는 시트는 첫 열)
+# 비밀번호처럼 스키마가 SECRET 인 열은 원문 대신 fingerprint() 값으로 비교한다.
+SIGNATURE_COLUMNS = {"결재데이터": ("결재ID", "상태", "결재일"), "User_List": ("아이디", "비밀번호", "권한", "고용형태")}
+# 시트에서 직접 편집/삭제한 내용을 놓치지 않도록 주기적으로 전체 재동기화 (초)
+FULL_RESYNC_SEC = 300
+# 증분 변경 기록 보관 수 (이보다 오래된 리비전 기준 변경분은 전체 재계산)
+CHANGE_LOG_SIZE = 256
+
+_RANGE_START_ROW = re.compile(r"![A-Z]*(\d+)")
+
+
+def col_letter(n):
+    s = ""
+    while n > 0:
+        n, r = divmod(n - 1, 26)
+        s = chr(65 + r) + s
+    return s or "A"
+
+
+class _SheetState:
+    def __init__(self, title):
+        self.title = title
+        self.header = None
+        self.df = pd.DataFrame()
+        self.n_rows = 0          # 헤더를 제외한 데이터 행 수
+        self.version = None      # 변경 확인 열 해시 (셀 수정 시트만)
+        self.sig = None          # 변경 확인 열의 원본 문자열 [열별 값 목록] (셀 수정 시트만)
+        self.sig_idx = []        # 변경 확인 열 위치
+        self.sig_secret = []     # 변경 확인 열별 SECRET 여부 (원문 대신 fingerprint 보관)
+        self.full_tried = 0.0    # 마지막 주기적 전체 동기화 시도 시각 (버려진 시도 포함)
+        self.synced_at = 0.0
+        self.checked_at = 0.0    # 마지막으로 API 로 변경 여부를 확인한 시각
+        self.rev = 0             # 데이터가 바뀔 때마다 증가 (파생 인덱스 캐시 키)
+        self.base_rev = 0        # 마지막 전체 동기화 리비전
+        self.log = []            # 전체 동기화 이후 변경분: (리비전, "append"/"patch", 시작 위치, 끝 위치, 열 이름)
+        self.dirty = True
+        self.stamp = 0           # 사본/상태를 바꾸는 로컬 작업마다 증가 (API 응답을 받는 사이의 변경 감지)
+        self.lock = threading.Lock()      # 사본 교체 (짧게만 잡음)
+        self.fetching = threading.Lock()  # 시트당 API 동기화는 한 번에 하나만
+
+
+class SheetSync:
+    def __init__(self, client, spreadsheet_id):
+        self.client = client
+        self.spreadsheet_id = spreadsheet_id
+        self._sh = None
+        self._ws = {}
+        self._states = {}
+        self._lock = threading.Lock()
+
+    # --- 핸들 캐시 ---
+    def spreadsheet(self):
+        if self._sh is None: self._sh = self.client.open_by_key(self.spreadsheet_id)
+        return self._sh
+
+    def worksheet(self, sheet):
+        ws = self._ws.get(sheet)
+        if ws is None:
+            sh = self.spreadsheet()
+            ws = sh.get_worksheet(sheet) if isinstance(sheet, int) else sh.worksheet(sheet)
+            self._ws[sheet] = ws
+        return ws
+
+    def _state(self, title):
+        with self._lock:
+            if title not in self._states: self._states[title] = _SheetState(title)
+            return self._states[title]
+
+
+    # --- 공개 API ---
+    def invalidate(self, sheet=None):
+        # 다음 frame() 호출 때 전체 재동기화 (None 이면 모든 시트)
+        titles = list(self._states) if sheet is None else [self.worksheet(sheet).title]
+        for t in titles:
+            state = self._state(t)
+            with state.lock:
+                state.dirty = True
+                state.stamp += 1
+
+    def forget(self, sheet):
+        # 시트 사본과 핸들을 메모리에서 내린다 (다시 쓰이면 처음부터 읽음). 오래된 보관 시트 정리용
+        title = self.worksheet(sheet).title
+        with self._lock:
+            self._states.pop(title, None)
+            for k in [k for k, ws in self._ws.items() if ws.title == title]: del self._ws[k]
+
+    def frame(self, sheet, max_age=0):
+        # API 응답을 기다리는 동안에는 사본 잠금을 잡지 않으므로 snapshot()/delta()/쓰기 반영이 막히지 않는다
+        ws = self.worksheet(sheet)
+        state = self._state(ws.title)
+        with state.fetching:
+            now = time.time()
+            if not state.dirty and state.header and now - state.checked_at < max_age: return state.df
+            state.checked_at = now
+            stamp = state.stamp
+            stale = now - max(state.synced_at, state.full_tried) > FULL_RESYNC_SEC
+            if state.dirty or not state.header:
+                self._full(ws, state, stamp)
+            elif stale:
+                # 주기적 전체 동기화가 쓰기 반영과 겹쳐 버려지면 다음 주기에 다시 시도하고, 이번에는 끝부분만 따라간다
+                # (쓰기가 계속 들어오는 시트에서 전체 다운로드만 반복하지 않도록)
+                state.full_tried = now
+                if not self._full(ws, state, stamp) and ws.title in APPEND_ONLY_SHEETS:
+                    self._tail(ws, state, state.stamp)
+            elif ws.title in APPEND_ONLY_SHEETS:
+                self._tail(ws, state, stamp)
+            elif self._remote_version(ws, state) != state.version:
+                self._full(ws, state, stamp)
+            return state.df
+
+    def age(self, sheet):
+        # 마지막으로 API 로 변경 여부를 확인한 뒤 지난 시간 (초, 한 번도 받지 않았으면 inf)
+        state = self._state(self.worksheet(sheet).title)
+        return time.time() - state.checked_at if state.header is not None else float("inf")
+
+    def snapshot(self, sheet):
+        # API 호출 없이 현재 사본과 리비전을 반환
+        state = self._state(self.worksheet(sheet).title)
+        with state.lock:
+            return state.rev, state.df
+
+    def delta(self, sheet, since):
+        # since 리비전 이후의 변경분 -> (리비전, 사본, 변경 목록 또는 None)
+        # None 이면 전체 동기화가 있었거나 기록이 잘려서 증분으로 따라갈 수 없다는 뜻
+        state = self._state(self.worksheet(sheet).title)
+        with state.lock:
+            if since == state.rev: return state.rev, state.df, []
+            if since < state.base_rev or since > state.rev or not state.log or state.log[0][0] > since + 1:
+                return state.rev, state.df, None
+            return state.rev, state.df, [c for c in state.log if c[0] > since]
+
+    # --- 쓰기 결과 반영 (write-through) ---
+    def append_local(self, sheet, rows, response=None):
+        # append_rows 가 성공한 행을 다시 읽지 않고 사본 끝에 붙인다.
+        # 응답의 시작 행이 사본 끝과 이어지지 않으면(다른 곳에서 추가됨) 다음 조회 때 증분 동기화에 맡긴다.
+        state = self._state(self.worksheet(sheet).title)
+        with state.lock:
+            if state.dirty or not state.header: return
+            start = _start_row(response)
+            if start is not None and start != state.n_rows + 2:
+                state.checked_at = 0.0
+                return
+            self._append_rows(state, rows)
+            state.stamp += 1
+
+    def patch_local(self, sheet, row, col, value, key=None):
+        # 셀 수정이 성공한 값을 사본에 반영 (사본을 복사해서 교체하므로 읽는 쪽과 충돌 없음)
+        # key=(열 번호, 값): 사본의 그 행이 같은 문서일 때만 반영 (행이 밀려 있으면 전체 재동기화)
+        state = self._state(self.worksheet(sheet).title)
+        with state.lock:
+            pos = row - 2
+            state.stamp += 1
+            if state.dirty or not state.header or not (0 <= pos < state.n_rows) or not (1 <= col <= len(state.header)) \
+                    or (key is not None and not (1 <= key[0] <= len(state.header) and str(state.df.iat[pos, key[0] - 1]) == str(key[1]))):
+                state.dirty = True
+                return
+            df = state.df.copy()
+            set_value(state.title, df, pos, col - 1, value)
+            state.df = df
+            if state.sig is not None and col - 1 in state.sig_idx:
+                k = state.sig_idx.index(col - 1)
+                state.sig[k][pos] = _sig_values([str(value)], state.sig_secret[k])[0]
+                state.version = _digest(state.sig)
+            self._bump(state, "patch", pos, pos + 1, state.header[col - 1])
+
+    # --- 동기화 ---
+    def _changed(self, state, stamp):
+        # 응답을 받는 사이에 쓰기 반영/무효화가 있었으면 그 응답은 버리고 다음 조회 때 다시 받는다
+        # (먼저 읽은 응답으로 덮어쓰면 방금 반영한 쓰기가 사라질 수 있음)
+        if state.stamp == stamp: return False
+        state.checked_at = 0.0
+        return True
+
+    def _full(self, ws, state, stamp):
+        # 적용했으면 True
+        data = ws.get_all_values()
+        with state.lock:
+            if state.header is None:
+                # 첫 동기화는 버릴 사본이 없으므로 적용하고, 그 사이 변경이 있었으면 다음 조회 때 다시 받음
+                self._apply_full(state, data)
+                state.dirty = self._changed(state, stamp)
+                return True
+            if self._changed(state, stamp): return False
+            self._apply_full(state, data)
+            return True
+
+    def _apply_full(self, state, data):
+        if not data:
+            state.header, state.df, state.n_rows = [], pd.DataFrame(), 0
+        else:
+            state.header = [str(c).strip() for c in data[0]]
+            state.df = typed(state.title, pd.DataFrame(data[1:], columns=state.header))
+            state.n_rows = len(data) - 1
+        if state.title not in APPEND_ONLY_SHEETS:
+            state.sig_idx = _signature_columns(state.title, state.header)
+            state.sig_secret = [is_secret(state.title, state.header[i]) if i < len(state.header) else False for i in state.sig_idx]
+            state.sig = [_sig_values([r[i] if len(r) > i else "" for r in data[1:]], s) for i, s in zip(state.sig_idx, state.sig_secret)]
+            state.version = _digest(state.sig)
+        state.synced_at = time.time()
+        state.rev += 1
+        state.base_rev = state.rev
+        state.log = []
+        state.dirty = False
+
+    def _tail(self, ws, state, stamp):
+        width = len(state.header)
+        rows = ws.get_values(f"A{state.n_rows + 2}:{col_letter(width)}")
+        while rows and not any(rows[-1]): rows = rows[:-1]  # 빈 범위는 [[]] 로 올 수 있음
+        with state.lock:
+            if self._changed(state, stamp): return
+            if rows: self._append_rows(state, rows)
+
+    def _append_rows(self, state, rows):
+        width = len(state.header)
+        rows = [([str(v) for v in r] + [""] * width)[:width] for r in rows]
+        new = typed(state.title, pd.DataFrame(rows, columns=state.header))
+        start = state.n_rows
+        state.df = concat_rows(state.df, new)
+        state.n_rows += len(rows)
+        if state.sig is not None:
+            for vals, i, s in zip(state.sig, state.sig_idx, state.sig_secret): vals.extend(_sig_values([r[i] for r in rows], s))
+            state.version = _digest(state.sig)
+        self._bump(state, "append", start, state.n_rows)
+
+    def _remote_version(self, ws, state):
+        # 변경 확인 열만 받아서 해시 (API 읽기 1회)
+        if state.sig is None: return None
+        ranges = [f"{col_letter(i + 1)}2:{col_letter(i + 1)}" for i in state.sig_idx]
+        cols = ws.batch_get(ranges)
+        return _digest([_sig_values([r[0] if r else "" for r in vals], s) for vals, s in zip(cols, state.sig_secret)])
+
+    def _bump(self, state, kind, start, stop, col=None):
+        state.rev += 1
+        state.log.append((state.rev, kind, start, stop, col))
+        if len(state.log) > CHANGE_LOG_SIZE: state.log = state.log[-CHANGE_LOG_SIZE:]
+
+
+def _signature_columns(title, header):
+    idx = [header.index(c) for c in SIGNATURE_COLUMNS.get(title, ()) if c in header]
+    return idx or [0]
+
+
+def _sig_values(vals, secret):
+    # 빈 값은 그대로 둔다 (_digest 가 끝의 빈 값을 빼고 비교)
+    return [fingerprint(v) if v != "" else "" for v in vals] if secret else vals
+
+
+def _digest(cols):
+    # 열별 값 목록 해시. 시트 API 는 끝쪽 빈 셀을 보내지 않으므로 양쪽 모두 끝의 빈 값은 빼고 비교
+    h = hashlib.blake2b(digest_size=16)
+    for vals in cols:
+        n = len(vals)
+        while n and vals[n - 1] == "": n -= 1
+        h.update("\x1f".join(vals[:n]).encode())
+        h.update(b"\x1e")
+    return h.hexdigest()
+
+
+def _start_row(response):
+    # append 응답의 updatedRange ("'시트'!A120:G121") 에서 시작 행 번호
+    try:
+        m = _RANGE_START_ROW.search(response["updates"]["updatedRange"])
+        return int(m.group(1)) if m else None
+    except (TypeError, KeyError):
+        return None
@@ -0,0 +1,89 @@
+# --- 시트 쓰기 일괄 처리 ---
+# 한 번의 사용자 동작에서 발생하는 쓰기를 모아서
+#  - 셀 수정은 스프레드시트 단위 values_batch_update 1회
+#  - 행 추가는 시트별 append_rows 1회
+# 로 보낸다. 워크시트 핸들은 SheetSync 의 캐시를 공유하고, 429(할당량 초과)는 지수 백오프로 재시도.
+# 쓰기가 성공하면 SheetSync 사본에 바로 반영(write-through)하므로 캐시 전체를 비울 필요가 없다.
+import random
+import time
+
+from gspread.exceptions import APIError
+
+from sheet_sync import col_letter
+
+MAX_RETRIES = 5
+BACKOFF_BASE_SEC = 1.0
+BACKOFF_MAX_SEC = 32.0
+
+
+def _status(e):
+    code = getattr(e, "code", None)
+    if code is None: code = getattr(getattr(e, "response", None), "status_code", None)
+    return code
+
+
+def with_backoff(fn, *args, **kwargs):
+    # 429 는 요청 자체가 거절된 것이므로 append 도 중복 없이 재시도할 수 있다
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            return fn(*args, **kwargs)
+        except APIError as e:
+            if _status(e) != 429 or attempt == MAX_RETRIES: raise
+            delay = min(BACKOFF_BASE_SEC * 2 ** attempt, BACKOFF_MAX_SEC)
+            time.sleep(delay + random.uniform(0, BACKOFF_BASE_SEC))
+
+
+def cell_a1(row, col):
+    return f"{col_letter(col)}{row}"
+
+
+class WriteBatch:
+    def __init__(self, writer):
+        self.writer = writer
+        self._updates = []   # (시트명, 행, 열, 값, 행 확인 키)
+        self._appends = {}   # 시트명 -> [행, ...] (추가 순서 유지)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # 블록 안에서 예외가 나면 아무것도 쓰지 않는다
+        if exc_type is None: self.flush()
+        return False
+
+    def _title(self, sheet):
+        return self.writer.sync.worksheet(sheet).title
+
+    def update_cell(self, sheet, row, col, value, key=None):
+        # key=(열 번호, 값): 사본 반영 전에 그 행이 맞는지 확인할 값 (예: 결재ID)
+        self._updates.append((self._title(sheet), int(row), int(col), value, key))
+
+    def append_row(self, sheet, values):
+        self._appends.setdefault(self._title(sheet), []).append(list(values))
+
+    def flush(self):
+        sync = self.writer.sync
+        if self._updates:
+            data = [{"range": f"'{t}'!{cell_a1(r, c)}", "values": [[v]]} for t, r, c, v, _ in self._updates]
+            with_backoff(sync.spreadsheet().values_batch_update, {"valueInputOption": "USER_ENTERED", "data": data})
+            for t, r, c, v, key in self._updates: sync.patch_local(t, r, c, v, key)
+        for t, rows in self._appends.items():
+            res = with_backoff(sync.worksheet(t).append_rows, rows)
+            sync.append_local(t, rows, res)
+        self._updates, self._appends = [], {}
+
+
+class SheetWriter:
+    def __init__(self, sync):
+        self.sync = sync
+
+    def batch(self):
+        return WriteBatch(self)
+
+    def append_row(self, sheet, values):
+        with self.batch() as wb: wb.append_row(sheet, values)
+
+    def update_cells(self, sheet, row, cols):
+        # cols: {열번호: 값}
+        with self.batch() as wb:
+            for col, value in cols.items(): wb.update_cell(sheet, row, col, value)
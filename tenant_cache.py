@@ -0,0 +1,92 @@
+# --- 사업장별 파티션 캐시 ---
+# 시트 사본(SheetSync)에서 사업자번호별 행만 잘라낸 파티션을 보관한다.
+# 최근에 쓰인 사업장의 파티션만 메모리에 남기고(LRU), 시트가 바뀌면 바뀐 행이 속한 사업장의 파티션만 다시 자른다.
+# 파티션은 원래 행 번호(index)를 유지하므로 row.name + 2 로 시트 행을 찾는 코드와 호환된다.
+# refresher 가 있으면 시트 확인은 백그라운드에 맡기고 마지막 사본에서 바로 자른다.
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from schema import prune_categories
+
+MAX_PARTITIONS = 128  # (시트, 사업장) 파티션 최대 보관 수
+FRESH_SEC = 2         # 이 시간 안에 확인한 시트는 API 를 다시 부르지 않음
+BIZ_COL = '사업자번호'
+
+
+class _Groups:
+    def __init__(self, rev, n, positions):
+        self.rev = rev              # 반영된 시트 리비전
+        self.n = n                  # 반영된 행 수
+        self.positions = positions  # 사업자번호 -> 행 위치 배열
+
+
+class TenantCache:
+    def __init__(self, sync, max_partitions=MAX_PARTITIONS, refresher=None):
+        self.sync = sync
+        self.refresher = refresher
+        self.max_partitions = max_partitions
+        self._groups = {}             # 시트명 -> _Groups
+        self._parts = OrderedDict()   # (시트명, 사업자번호) -> [파티션 버전, DataFrame, 확인한 시트 리비전]
+        self._lock = threading.Lock()
+
+    def frame(self, sheet, biz, max_age=FRESH_SEC):
+        self.ensure(sheet, max_age)
+        return self.partition(sheet, biz)[1]
+
+    def ensure(self, sheet, max_age=FRESH_SEC):
+        if self.refresher is not None: self.refresher.frame(sheet)
+        else: self.sync.frame(sheet, max_age=max_age)
+
+    def partition(self, sheet, biz):
+        # API 호출 없이 현재 사본에서 해당 사업장 행만 반환 -> (파티션 버전, DataFrame)
+        # 파티션 버전은 그 사업장 행이 바뀐 경우에만 바뀐다 (다른 사업장의 쓰기에는 영향 없음)
+        title = self.sync.worksheet(sheet).title
+        key = (title, str(biz))
+        with self._lock:
+            rev, df, g = self._refresh(title)
+            hit = self._parts.get(key)
+            if hit is not None and hit[2] == rev:
+                self._parts.move_to_end(key)
+                return hit[0], hit[1]
+            pos = g.positions.get(str(biz))
+            part = [rev, prune_categories(df.iloc[pos] if pos is not None else df.iloc[0:0]), rev]
+            self._parts[key] = part
+            self._parts.move_to_end(key)
+            while len(self._parts) > self.max_partitions: self._parts.popitem(last=False)
+            return part[0], part[1]
+
+    def forget(self, sheet):
+        # 시트의 파티션과 사업장 그룹을 모두 버린다 (SheetSync.forget 과 함께 사용)
+        with self._lock:
+            self._groups.pop(sheet, None)
+            for key in [k for k in self._parts if k[0] == sheet]: del self._parts[key]
+
+    def _refresh(self, title):
+        g = self._groups.get(title)
+        rev, df, changes = self.sync.delta(title, g.rev if g is not None else -1)
+        if g is not None and rev == g.rev: return rev, df, g
+        if g is None or changes is None or any(c[1] == "patch" and c[4] == BIZ_COL for c in changes):
+            # 전체 동기화가 있었으면 그룹을 다시 만들고 이 시트의 파티션은 모두 버린다
+            g = self._groups[title] = _Groups(rev, len(df), self._group(df, 0))
+            for key in [k for k in self._parts if k[0] == title]: del self._parts[key]
+            return rev, df, g
+
+        # 증분 변경: 바뀐 행이 속한 사업장만 파티션을 버리고, 나머지는 확인 리비전만 올린다
+        touched = np.unique(np.concatenate([np.arange(c[2], c[3]) for c in changes]))
+        affected = set(df[BIZ_COL].iloc[touched].astype(str)) if BIZ_COL in df.columns else set()
+        for b, p in self._group(df, g.n).items():
+            g.positions[b] = np.concatenate([g.positions[b], p]) if b in g.positions else p
+        g.rev, g.n = rev, len(df)
+        for key in [k for k in self._parts if k[0] == title]:
+            if key[1] in affected: del self._parts[key]
+            else: self._parts[key][2] = rev
+        return rev, df, g
+
+    def _group(self, df, start):
+        # start 행부터 사업자번호별 위치 (전체 사본 기준)
+        if df.empty or BIZ_COL not in df.columns or start >= len(df): return {}
+        # 사업자번호는 category 열이라 문자열 변환 없이 범주 코드로 묶인다
+        tail = df[BIZ_COL].iloc[start:]
+        return {str(b): p + start for b, p in tail.groupby(tail, sort=False, observed=True).indices.items()}
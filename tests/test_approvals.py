@@ -0,0 +1,55 @@
+from gspread.exceptions import WorksheetNotFound
+
+from approvals import DONE, ApprovalEngine
+from sheet_writer import SheetWriter
+from test_sheet_sync import setup
+
+
+def test_relocated_row_does_not_patch_other_document():
+    sh, sync = setup()
+    # 다른 곳에서 APP-1 행을 지워 APP-2 가 한 행 위로 밀림 (사본은 아직 모름)
+    ws = sh.worksheet("결재데이터")
+    sh.batch_update({"requests": [{"deleteDimension": {"range": {"sheetId": ws.id, "dimension": "ROWS", "startIndex": 1, "endIndex": 2}}}]})
+    doc = sync.frame("결재데이터", max_age=3600).iloc[1]
+    nxt, failed = ApprovalEngine(SheetWriter(sync)).approve(doc, "mgr", "2026-10-03")
+    assert failed == []
+    df = sync.frame("결재데이터", max_age=3600)
+    assert list(df["결재ID"].astype(str)) == ["APP-2"]
+    assert list(df["상태"].astype(str)) == [nxt]
+
+
+def test_approve_in_place_writes_through():
+    sh, sync = setup()
+    doc = sync.frame("결재데이터").iloc[1]
+    nxt, failed = ApprovalEngine(SheetWriter(sync)).approve(doc, "mgr", "2026-10-03")
+    assert failed == []
+    n = sh.calls.get(("결재데이터", "read"), 0)
+    df = sync.frame("결재데이터", max_age=3600)
+    assert sh.calls.get(("결재데이터", "read"), 0) == n
+    assert list(df["상태"].astype(str)) == ["대기", nxt]
+
+
+LEAVE = [("Schedules", ["111", "2026-10-20", "김", "[연차] t"])]
+
+
+def test_missing_schedules_sheet_still_approves():
+    sh, sync = setup()
+    doc = sync.frame("결재데이터").iloc[0]
+    nxt, failed = ApprovalEngine(SheetWriter(sync)).approve(doc, "mgr", "2026-10-03", LEAVE)
+    assert nxt == DONE
+    assert [(s, type(e)) for s, e in failed] == [("Schedules", WorksheetNotFound)]
+    assert sh.worksheet("결재데이터").get_all_values()[1][7] == DONE
+
+
+def test_schedule_append_failure_keeps_approval(monkeypatch):
+    sh, sync = setup()
+    ws = sh.add_worksheet("Schedules", [["사업자번호", "날짜", "이름", "일정"]])
+
+    def fail(*a, **k): raise RuntimeError("network")
+    monkeypatch.setattr(ws, "append_rows", fail)
+    doc = sync.frame("결재데이터").iloc[0]
+    nxt, failed = ApprovalEngine(SheetWriter(sync)).approve(doc, "mgr", "2026-10-03", LEAVE)
+    assert nxt == DONE and [s for s, _ in failed] == ["Schedules"]
+    assert sh.worksheet("결재데이터").get_all_values()[1][7] == DONE
+    assert str(sync.frame("결재데이터", max_age=3600)["상태"].iloc[0]) == DONE
+    assert ws.get_all_values()[1:] == []
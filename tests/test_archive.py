@@ -0,0 +1,79 @@
+from datetime import date
+
+import pytest
+
+import archive
+from archive import AttendanceHistory, compact
+from fake_sheets import FakeClient
+from sheet_sync import SheetSync
+from tenant_cache import TenantCache
+
+HEADER = ["사업자번호", "아이디", "이름", "일시", "구분", "비고", "기타"]
+TODAY = date(2026, 10, 17)
+
+
+def row(day, kind="출근"):
+    return ["111", "kim", "김", f"{day} 09:00:00", kind, "", ""]
+
+
+OLD = [row("2026-07-01"), row("2026-07-01"), row("2026-08-03"), row("2026-08-04", "퇴근")]
+HOT = [row("2026-09-01"), row("2026-10-01")]
+
+
+def setup():
+    c = FakeClient({"Attendance_Records": [HEADER] + OLD[:2] + HOT[:1] + OLD[2:] + HOT[1:]})
+    return c.spreadsheet, SheetSync(c, "k")
+
+
+def values(sh, title):
+    return sh.worksheet(title).get_all_values()[1:]
+
+
+def test_rerun_after_failed_delete_does_not_duplicate(monkeypatch):
+    sh, sync = setup()
+
+    def fail(body): raise RuntimeError("network")
+    monkeypatch.setattr(sh, "batch_update", fail)
+    with pytest.raises(RuntimeError): compact(sync, TODAY)
+    # 보관 시트에는 들어갔지만 원본은 그대로
+    assert values(sh, "Attendance_Records_2026-07") == OLD[:2]
+    assert len(values(sh, "Attendance_Records")) == 6
+
+    monkeypatch.undo()
+    assert compact(sync, TODAY) == {"Attendance_Records_2026-07": 2, "Attendance_Records_2026-08": 2}
+    # 같은 행이 두 번 있어도 개수로 비교하므로 중복 없이 이어진다
+    assert values(sh, "Attendance_Records_2026-07") == OLD[:2]
+    assert values(sh, "Attendance_Records_2026-08") == OLD[2:]
+    assert values(sh, "Attendance_Records") == HOT
+
+
+def test_sheet_changed_mid_run_skips_delete(monkeypatch):
+    sh, sync = setup()
+    orig = archive._archive
+
+    def edit_during(sync, title, header, rows):
+        orig(sync, title, header, rows)
+        sh.worksheet("Attendance_Records").update_cell(4, 6, "수정")
+    monkeypatch.setattr(archive, "_archive", edit_during)
+    with pytest.raises(RuntimeError): compact(sync, TODAY)
+    assert len(values(sh, "Attendance_Records")) == 6
+
+    monkeypatch.undo()
+    compact(sync, TODAY)
+    # 다시 실행하면 이미 보관된 행은 건너뛰고 원본 삭제까지 끝난다 (편집 내용 유지)
+    assert values(sh, "Attendance_Records_2026-07") == OLD[:2]
+    assert values(sh, "Attendance_Records_2026-08") == OLD[2:]
+    assert values(sh, "Attendance_Records") == [HOT[0][:5] + ["수정", ""], HOT[1]]
+
+
+def test_history_evicts_least_recent_archive():
+    sh, sync = setup()
+    compact(sync, TODAY)
+    tc = TenantCache(sync)
+    hist = AttendanceHistory(sync, tc, max_archives=1)
+    assert len(hist.frame("111", date(2026, 7, 1), TODAY)) == 6
+    assert hist.loaded() == ["Attendance_Records_2026-08"]
+    assert "Attendance_Records_2026-07" not in sync._states
+    assert all(k[0] != "Attendance_Records_2026-07" for k in tc._parts)
+    assert len(hist.frame("111", date(2026, 7, 1), date(2026, 7, 31))) == 4
+    assert hist.loaded() == ["Attendance_Records_2026-07"]
@@ -0,0 +1,6 @@
+import bench
+
+
+def test_quota_limited_run_counts_429_instead_of_crashing(capsys):
+    assert bench.main(["--size", "small", "--repeats", "1", "--read-quota", "10"]) == 0
+    assert " 429 " in capsys.readouterr().out
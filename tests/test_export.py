@@ -0,0 +1,49 @@
+import io
+import zipfile
+from datetime import date
+
+import pandas as pd
+
+from attendance import build_attendance_index
+from export import build_export, export_tables
+from schema import typed
+
+ATT_HEADER = ["사업자번호", "아이디", "이름", "일시", "구분", "비고", "기타"]
+
+
+def recs(rows):
+    return typed("Attendance_Records", pd.DataFrame(rows, columns=ATT_HEADER))
+
+
+def tables(df):
+    return export_tables(df, pd.DataFrame(), build_attendance_index(df), "111", date(2026, 10, 1), date(2026, 10, 31))
+
+
+def test_punch_keys_are_not_exported():
+    df = recs([["111", "kim", "김", "2026-10-01 09:00:00", "출근", "", "punch:abc"],
+               ["111", "kim", "김", "2026-10-01 18:00:00", "퇴근", "", "메모"]])
+    att = dict(tables(df))["근태기록"]
+    assert list(att["기타"]) == ["", "메모"]
+    with zipfile.ZipFile(io.BytesIO(build_export("csv", tables(df)))) as zf:
+        assert "punch:" not in zf.read("근태기록.csv").decode("utf-8-sig")
+
+
+def test_tenant_export_holds_only_own_values():
+    import pyarrow.parquet as pq
+    from fake_sheets import FakeClient
+    from sheet_sync import SheetSync
+    from tenant_cache import TenantCache
+
+    rows = [["111", "kim", "김", "2026-10-01 09:00:00", "출근", "", ""],
+            ["222", "lee", "이", "2026-10-01 09:00:00", "출근", "", ""],
+            ["222", "park", "박", "2026-10-01 18:00:00", "퇴근", "", ""]]
+    tc = TenantCache(SheetSync(FakeClient({"Attendance_Records": [ATT_HEADER] + rows}), "k"))
+    part = tc.frame("Attendance_Records", "111")
+    assert list(part["이름"].cat.categories) == ["김"]
+    assert list(part.index) == [0]   # 원래 행 번호 유지
+    with zipfile.ZipFile(io.BytesIO(build_export("parquet", tables(part)))) as zf:
+        table = pq.read_table(io.BytesIO(zf.read("근태기록.parquet")))
+    for name in table.column_names:
+        col = table.column(name).combine_chunks()
+        values = col.dictionary.to_pylist() if hasattr(col, "dictionary") else col.to_pylist()
+        assert not {"222", "lee", "park", "이", "박"} & set(map(str, values)), name
@@ -0,0 +1,71 @@
+import time
+
+import pytest
+
+from fake_sheets import FakeClient
+from journal import RETRY_MAX_SEC, PunchJournal
+from sheet_sync import SheetSync
+from sheet_writer import SheetWriter
+
+HEADER = ["사업자번호", "아이디", "이름", "일시", "구분", "비고", "기타"]
+ROW = ["111", "kim", "김", "2026-10-17 09:00:00", "출근", "", ""]
+
+
+@pytest.fixture
+def env(tmp_path):
+    c = FakeClient({"Attendance_Records": [HEADER]})
+    sync = SheetSync(c, "k")
+    sync.frame("Attendance_Records")
+    j = PunchJournal(SheetWriter(sync), path=str(tmp_path / "j.db"))
+    j.close()   # 백그라운드 플러셔는 멈추고 flush() 를 직접 부른다
+    j._thread.join(5)
+    return c.spreadsheet.worksheet("Attendance_Records"), j
+
+
+def due_now(j):
+    with j._db() as db: db.execute("UPDATE punches SET next_try = 0")
+
+
+def test_retry_after_unclear_failure_does_not_duplicate(env, monkeypatch):
+    ws, j = env
+    orig = ws.append_rows
+
+    def lands_then_fails(*a, **k):
+        orig(*a, **k)
+        raise RuntimeError("timeout")
+    monkeypatch.setattr(ws, "append_rows", lands_then_fails)
+    j.record(ROW)
+    assert j.flush() == 0
+    assert j.backlog() == (1, "timeout")
+
+    monkeypatch.undo()
+    due_now(j)
+    j.flush()
+    assert len(ws.get_all_values()) == 2
+    assert j.backlog() == (0, None)
+
+
+def test_failed_flush_backs_off(env, monkeypatch):
+    ws, j = env
+
+    calls = []
+
+    def fail(*a, **k):
+        calls.append(1)
+        raise RuntimeError("down")
+    monkeypatch.setattr(ws, "append_rows", fail)
+    j.record(ROW)
+    waits = []
+    for _ in range(3):
+        due_now(j)
+        t0 = time.time()
+        j.flush()
+        with j._db() as db: waits.append(round(db.execute("SELECT next_try FROM punches").fetchone()[0] - t0))
+    assert waits == [1, 2, 4]
+    # 아직 재시도 시각이 안 됐으면 보내지 않는다
+    assert j.flush() == 0
+    with j._db() as db: db.execute("UPDATE punches SET attempts = 20, next_try = 0")
+    t0 = time.time()
+    j.flush()
+    with j._db() as db: assert round(db.execute("SELECT next_try FROM punches").fetchone()[0] - t0) == RETRY_MAX_SEC
+    assert len(ws.get_all_values()) == 1
@@ -0,0 +1,12 @@
+from metrics import _size
+
+
+def test_size_is_exact_for_small_payloads():
+    assert _size([["가", "ab"], ["", "1"]]) == 3 + 2 + 1
+    assert _size({"data": [{"range": "A1", "values": [["x"]]}]}) == 3
+
+
+def test_size_estimates_large_responses_from_a_sample():
+    rows = [["111", f"user{i:06d}", "2026-10-01 09:00:00", "출근" if i % 2 else "퇴근"] for i in range(200000)]
+    exact = sum(len(v.encode()) for r in rows for v in r)
+    assert abs(_size(rows) - exact) / exact < 0.01
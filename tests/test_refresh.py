@@ -0,0 +1,52 @@
+import time
+
+import sheet_sync
+from fake_sheets import FakeClient
+from metrics import METRICS, instrument
+from refresher import SheetRefresher
+from sheet_sync import SheetSync
+
+ATT = [["사업자번호", "아이디", "이름", "일시", "구분", "비고", "기타"],
+       ["111", "kim", "김", "2026-10-01 09:00:00", "출근", "", ""]]
+ROW = ["111", "lee", "이", "2026-10-01 09:30:00", "출근", "", ""]
+
+
+def test_discarded_periodic_resync_falls_back_to_tail(monkeypatch):
+    c = FakeClient({"Attendance_Records": ATT})
+    sh, sync = c.spreadsheet, SheetSync(c, "k")
+    sync.frame("Attendance_Records")
+    ws = sh.worksheet("Attendance_Records")
+    ws.append_rows([ROW])   # 다른 곳에서 추가된 행
+    state = sync._state("Attendance_Records")
+    state.synced_at -= sheet_sync.FULL_RESYNC_SEC + 1
+    real = ws.get_all_values
+
+    def racing():
+        # 전체 다운로드 도중 로컬 쓰기 반영이 끼어든다
+        data = real()
+        with state.lock: state.stamp += 1
+        return data
+
+    monkeypatch.setattr(ws, "get_all_values", racing)
+    df = sync.frame("Attendance_Records")
+    assert list(df["아이디"].astype(str)) == ["kim", "lee"]
+    # 다음 조회는 전체 다운로드를 반복하지 않고 끝부분만 확인
+    n = sh.calls[("Attendance_Records", "read")]
+    sync.frame("Attendance_Records")
+    assert sh.calls[("Attendance_Records", "read")] - n == 1
+    assert state.full_tried > 0
+
+
+def test_background_calls_are_reported_per_run():
+    c = FakeClient({"Attendance_Records": ATT})
+    sync = SheetSync(instrument(c), "k")
+    r = SheetRefresher(sync, interval=0.05)
+    try:
+        run = METRICS.begin_run()
+        r.frame("Attendance_Records")   # 첫 동기화는 작업 스레드에서
+        time.sleep(0.3)
+        bg = METRICS.background_since(run)
+        assert run.api_calls <= 2        # 시트 핸들 조회만 실행 스레드에서
+        assert bg["by_sheet"]["Attendance_Records"]["calls"] >= 1
+    finally:
+        r.close()
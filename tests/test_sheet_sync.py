@@ -0,0 +1,54 @@
+from fake_sheets import FakeClient
+from sheet_sync import SheetSync
+from sheet_writer import SheetWriter
+
+ATT = [["사업자번호", "아이디", "이름", "일시", "구분", "비고", "기타"],
+       ["111", "kim", "김", "2026-10-01 09:00:00", "출근", "", ""]]
+APP = [["결재ID", "사업자번호", "기안자ID", "이름", "결재유형", "제목", "내용", "상태", "기안일", "결재일", "결재자ID"],
+       ["APP-1", "111", "kim", "김", "휴가", "t", "c", "대기", "2026-10-01", "", "mgr"],
+       ["APP-2", "111", "kim", "김", "휴가", "t", "c", "대기", "2026-10-02", "", "mgr"]]
+USERS = [["사업자번호", "사업장명", "아이디", "비밀번호", "이름", "권한"],
+         ["111", "가게", "mgr", "pw", "관리자", "Manager"]]
+
+
+def setup():
+    c = FakeClient({"Attendance_Records": ATT, "결재데이터": APP, "User_List": USERS})
+    sync = SheetSync(c, "k")
+    for s in ("Attendance_Records", "결재데이터", "User_List"): sync.frame(s)
+    return c.spreadsheet, sync
+
+
+def reads(sh, title):
+    return sh.calls.get((title, "read"), 0)
+
+
+def test_append_elsewhere_does_not_reload_edited_sheets():
+    sh, sync = setup()
+    SheetWriter(sync).append_row("Attendance_Records", ["111", "kim", "김", "2026-10-01 18:00:00", "퇴근", "", ""])
+    before = {t: reads(sh, t) for t in ("결재데이터", "User_List")}
+    for t in before: sync.frame(t)
+    # 변경 확인 열 batch_get 1회씩만, 전체 다시 받기 없음
+    assert {t: reads(sh, t) - n for t, n in before.items()} == {"결재데이터": 1, "User_List": 1}
+
+
+def test_remote_state_edit_is_detected():
+    sh, sync = setup()
+    sh.worksheet("결재데이터").update_cell(3, 8, "승인")
+    df = sync.frame("결재데이터")
+    assert list(df["상태"].astype(str)) == ["대기", "승인"]
+
+
+def test_write_through_keeps_signature():
+    sh, sync = setup()
+    SheetWriter(sync).update_cells("결재데이터", 2, {8: "1차 승인", 10: "2026-10-03"})
+    n = reads(sh, "결재데이터")
+    df = sync.frame("결재데이터")
+    assert reads(sh, "결재데이터") - n == 1
+    assert str(df["상태"].iloc[0]) == "1차 승인"
+
+
+def test_append_only_sheet_reads_tail():
+    sh, sync = setup()
+    sh.worksheet("Attendance_Records").append_rows([["111", "lee", "이", "2026-10-01 09:30:00", "출근", "", ""]])
+    df = sync.frame("Attendance_Records")
+    assert list(df["아이디"].astype(str)) == ["kim", "lee"]
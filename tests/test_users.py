@@ -0,0 +1,32 @@
+from sheet_writer import SheetWriter
+from tenant_cache import TenantCache
+from test_sheet_sync import setup
+from users import build_user_directory
+
+PLAIN = "pw"
+
+
+def test_password_is_not_kept_in_plaintext():
+    sh, sync = setup()
+    state = sync._states["User_List"]
+    part = TenantCache(sync).frame("User_List", "111")
+    assert "$" in str(state.df["비밀번호"].iloc[0])
+    assert not any(v == PLAIN for v in state.df["비밀번호"].astype(str))
+    assert not any(v == PLAIN for vals in state.sig for v in vals)
+    assert not any(v == PLAIN for v in part["비밀번호"].astype(str))
+    d = build_user_directory(sync.frame("User_List"))
+    assert not any(stored == PLAIN for rows in d._by_id.values() for stored, _ in rows)
+    assert d.authenticate("mgr", PLAIN)["이름"] == "관리자"
+    assert d.authenticate("mgr", "x") is None
+
+
+def test_password_change_is_detected():
+    sh, sync = setup()
+    # 쓰기 반영은 사본에서 바로 해시되고, 변경 확인 열 해시도 원격과 같아 다시 받지 않는다
+    SheetWriter(sync).update_cells("User_List", 2, {4: "new"})
+    n = sh.calls.get(("User_List", "read"), 0)
+    assert build_user_directory(sync.frame("User_List")).authenticate("mgr", "new") is not None
+    assert sh.calls.get(("User_List", "read"), 0) - n == 1
+    # 시트에서 직접 바꾼 비밀번호는 변경 확인 열로 감지
+    sh.worksheet("User_List").update_cell(2, 4, "other")
+    assert build_user_directory(sync.frame("User_List")).authenticate("mgr", "other") is not None
@@ -0,0 +1,56 @@
+from datetime import date
+
+import pandas as pd
+
+from attendance import build_attendance_index
+from export import build_export, export_tables
+from schema import typed
+from work_hours import break_minutes, month_summary, month_table
+
+HEADER = ["사업자번호", "아이디", "이름", "일시", "구분", "비고", "기타"]
+TODAY = date(2026, 10, 17)
+
+
+def recs(rows):
+    return typed("Attendance_Records", pd.DataFrame([["111", u, u, t, k, "", ""] for u, t, k in rows], columns=HEADER))
+
+
+def statuses(rows):
+    t = month_table(build_attendance_index(recs(rows)), "111", 2026, 10, today=TODAY)
+    return dict(zip(t["아이디"] + " " + t["날짜"], t["상태"]))
+
+
+def test_break_deduction_thresholds():
+    assert list(break_minutes(pd.Series([0, 239, 240, 479, 480, 600]).to_numpy())) == [0, 0, 30, 30, 60, 60]
+
+
+def test_status_by_net_minutes():
+    s = statuses([
+        ("ok", "2026-10-01 09:00:00", "출근"), ("ok", "2026-10-01 17:40:00", "퇴근"),      # 520 - 60 = 460
+        ("low", "2026-10-01 09:00:00", "출근"), ("low", "2026-10-01 17:39:00", "퇴근"),    # 459
+        ("high", "2026-10-01 09:00:00", "출근"), ("high", "2026-10-01 18:21:00", "퇴근"),  # 501
+        ("short", "2026-10-01 09:00:00", "출근"), ("short", "2026-10-01 13:00:00", "퇴근"),  # 240 - 30
+    ])
+    assert s == {"ok 2026-10-01": "정상", "low 2026-10-01": "미달", "high 2026-10-01": "초과", "short 2026-10-01": "미달"}
+
+
+def test_missing_unreadable_and_open_shift():
+    rows = [
+        ("kim", "2026-10-02 09:00:00", "출근"),                                          # 지난 날 퇴근 없음
+        ("kim", "2026-10-05 9시", "출근"), ("kim", "2026-10-05 18:00:00", "퇴근"),      # 출근 시각을 읽을 수 없음
+        ("kim", "2026-10-17 09:00:00", "출근"),                                          # 오늘, 아직 퇴근 전
+    ]
+    s = statuses(rows)
+    assert s == {"kim 2026-10-02": "누락", "kim 2026-10-05": "오류", "kim 2026-10-17": "근무중"}
+    idx = build_attendance_index(recs(rows))
+    rec = idx.get("111", "kim", "2026-10-05")
+    assert rec.in_at is None and rec.in_text == "9시" and rec.out_at is not None
+    summary = month_summary(month_table(idx, "111", 2026, 10, today=TODAY))
+    assert summary[["근무일수", "누락"]].values.tolist() == [[0, 1]]
+
+
+def test_unreadable_rows_are_exported():
+    r = recs([("kim", "2026-10-05 9시", "출근"), ("kim", "2026-10-05 18:00:00", "퇴근")])
+    tables = export_tables(r, pd.DataFrame(), build_attendance_index(r), "111", date(2026, 10, 1), TODAY)
+    assert list(tables[0][1]["일시"]) == ["2026-10-05 9시", "2026-10-05 18:00:00"]
+    assert build_export("parquet", tables)
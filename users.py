@@ -0,0 +1,41 @@
+# --- 사용자 디렉터리 ---
+# User_List 가 바뀔 때 한 번만 만들어서, 로그인은 아이디 사전 조회 + 해시 비교,
+# 결재자 선택은 사업장별로 미리 만든 관리자 목록 조회로 끝낸다.
+# 비밀번호는 시트 사본을 만들 때 schema(SECRET) 에서 이미 솔트 해시로 바뀌어 있으므로, 여기서는 그 해시만 비교한다.
+from schema import check_secret
+
+PW_COL = '비밀번호'
+MANAGER = 'Manager'
+
+
+class UserDirectory:
+    def __init__(self):
+        self._by_id = {}      # 아이디 -> [(비밀번호 해시, 사용자 정보)] (같은 아이디가 여러 행일 수 있음, 시트 순서)
+        self._managers = {}   # 사업자번호 -> [(아이디, 이름)]
+
+    def authenticate(self, uid, pw):
+        # 아이디/비밀번호가 맞는 첫 사용자 정보 (비밀번호 제외), 없으면 None
+        for stored, info in self._by_id.get(str(uid), []):
+            if check_secret(stored, pw): return dict(info)
+        return None
+
+    def managers(self, biz):
+        return self._managers.get(str(biz), [])
+
+    def __len__(self):
+        return len(self._by_id)
+
+
+def build_user_directory(df):
+    d = UserDirectory()
+    if df.empty or not {'아이디', PW_COL} <= set(df.columns): return d
+    # 헤더가 빈 열이 여러 개일 수 있어서 위치로 읽는다 (같은 이름은 뒤 열 값이 남음, 기존 to_dict 와 같음)
+    keep = [i for i, c in enumerate(df.columns) if c != PW_COL]
+    names = [df.columns[i] for i in keep]
+    columns = [df.iloc[:, i].astype(str) for i in keep]
+    for vals, stored in zip(zip(*columns), df[PW_COL].astype(str)):
+        info = dict(zip(names, vals))
+        d._by_id.setdefault(info['아이디'], []).append((stored, info))
+        if info.get('권한') == MANAGER:
+            d._managers.setdefault(info.get('사업자번호', ''), []).append((info['아이디'], info.get('이름', '')))
+    return d
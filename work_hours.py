@@ -0,0 +1,140 @@
+# --- 월간 근로시간 계산 ---
+# 사업장 한 곳의 한 달치 (직원 x 일) 실 근로시간을 pandas 벡터 연산 한 번으로 계산한다.
+# 근무 관리 표, 엑셀 추출, 월간 요약이 모두 이 표를 공유한다.
+import calendar
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+# 근로 기준 시간 (유연근무: 7시간 40분 ~ 8시간 20분)
+MIN_WORK_MINUTES = 7 * 60 + 40  # 460분
+MAX_WORK_MINUTES = 8 * 60 + 20  # 500분
+
+# 상태: 정상 / 미달 / 초과 / 누락(출근 또는 퇴근 기록 없음) / 오류(기록은 있으나 시각을 읽을 수 없음) / 근무중(오늘 출근만 있음)
+WARN_STATUSES = ("미달", "초과")
+COLUMNS = ["아이디", "이름", "날짜", "출근", "퇴근", "총근무분", "휴게분", "실근로분", "상태", "경고"]
+
+# 근무 관리 표 페이지 (User_List 에 팀 열이 있으면 팀별, 없으면 GRID_PAGE_SIZE 명씩)
+TEAM_COL = '팀'
+GRID_PAGE_SIZE = 20
+WEEKDAYS = ["월", "화", "수", "목", "금", "토", "일"]
+GRID_COLORS = {"warn": "background-color:#fde2e2; color:#e02424; font-weight:bold;",
+               "ok": "background-color:#e6f4ea;",
+               "miss": "background-color:#f3f4f6; color:gray;"}
+
+
+def break_minutes(total):
+    # 법정 휴게시간 차감 (4시간 이상 30분, 8시간 이상 1시간)
+    return np.where(total >= 480, 60, np.where(total >= 240, 30, 0))
+
+
+def fmt_minutes(m):
+    return f"{int(m // 60)}시간 {int(m % 60)}분"
+
+
+def month_table(idx, biz, year, month, staffs=None, today=None):
+    # today: 이 날짜의 출근만 있는 기록은 아직 퇴근 전이므로 누락이 아니라 근무중 (기본 오늘)
+    days = idx.days
+    m = days[(days["b"] == str(biz)) & days["d"].str.startswith(f"{year}-{month:02d}")]
+    names = {}
+    if staffs is not None and not staffs.empty:
+        names = dict(zip(staffs['아이디'].astype(str), staffs['이름']))
+        m = m[m["u"].isin(names)]
+    if m.empty: return pd.DataFrame(columns=COLUMNS)
+    uid = m["u"].astype(str)
+
+    # 출근/퇴근은 근태 인덱스에서 이미 datetime64
+    t0 = pd.to_datetime(m["in_at"], errors="coerce")
+    t1 = pd.to_datetime(m["out_at"], errors="coerce")
+    total = (t1 - t0).dt.total_seconds() / 60
+    deduction = break_minutes(total.to_numpy())
+    net = total - deduction
+    has_both = m["in_at"].notna() & m["out_at"].notna()
+    error = (m["in_at"].isna() & m["in_bad"]) | (m["out_at"].isna() & m["out_bad"])
+    open_shift = m["in_at"].notna() & m["out_at"].isna() & (m["d"].astype(str) == (today or date.today()).isoformat())
+    status = np.select(
+        [error, open_shift, ~has_both, net < MIN_WORK_MINUTES, net > MAX_WORK_MINUTES],
+        ["오류", "근무중", "누락", "미달", "초과"], "정상")
+
+    out = pd.DataFrame({
+        "아이디": uid.to_numpy(),
+        "이름": uid.map(names).fillna("").to_numpy() if names else "",
+        "날짜": m["d"].astype(str).to_numpy(),
+        "출근": m["in_at"].to_numpy(),
+        "퇴근": m["out_at"].to_numpy(),
+        "총근무분": total.to_numpy(),
+        "휴게분": np.where(total.isna(), np.nan, deduction),
+        "실근로분": net.to_numpy(),
+        "상태": status,
+    })
+    out["경고"] = out["상태"].isin(WARN_STATUSES)
+    return out.sort_values(["날짜", "아이디"], ignore_index=True)
+
+
+def month_summary(table):
+    if table.empty:
+        return pd.DataFrame(columns=["아이디", "이름", "근무일수", "실근로(시간)", "미달", "초과", "누락"])
+    worked = table["상태"].isin(("정상", "미달", "초과"))
+    g = table.assign(
+        근무일수=worked,
+        실근로=table["실근로분"].where(worked, 0),
+        미달=table["상태"] == "미달",
+        초과=table["상태"] == "초과",
+        누락=table["상태"] == "누락",
+    ).groupby(["아이디", "이름"], sort=False)
+    s = g[["근무일수", "실근로", "미달", "초과", "누락"]].sum().reset_index()
+    s["실근로(시간)"] = (s.pop("실근로") / 60).round(1)
+    return s[["아이디", "이름", "근무일수", "실근로(시간)", "미달", "초과", "누락"]]
+
+
+# --- 근무 관리 표 (직원 x 일) ---
+def week_pages(year, month):
+    # 달력 주 단위 -> {"1주차 (1~5일)": [1, ..., 5], ...}
+    pages = {}
+    for i, week in enumerate(calendar.monthcalendar(year, month), 1):
+        days = [d for d in week if d]
+        pages[f"{i}주차 ({days[0]}~{days[-1]}일)"] = days
+    return pages
+
+
+def staff_pages(staffs, size=GRID_PAGE_SIZE):
+    if staffs.empty: return {"전체": staffs}
+    if TEAM_COL in staffs.columns:
+        team = staffs[TEAM_COL].astype(str).str.strip().replace("", "미지정")
+        return {t: g for t, g in staffs.groupby(team, sort=True)}
+    return {f"{i + 1}~{min(i + size, len(staffs))}번": staffs.iloc[i:i + size] for i in range(0, len(staffs), size)}
+
+
+def day_column(year, month, day):
+    return f"{day}({WEEKDAYS[date(year, month, day).weekday()]})"
+
+
+def month_grid(table, staffs, year, month, days):
+    # 행 = 직원(staffs 순서), 열 = 일. 칸: 실 근로 "7:40", 미달/초과는 "🚨 8:45", 기록 이상은 "누락"/"오류"
+    ids = staffs['아이디'].astype(str).tolist()
+    cols = [day_column(year, month, d) for d in days]
+    grid = pd.DataFrame("", index=pd.Index(ids), columns=cols)
+    if not table.empty and ids:
+        t = table[table["아이디"].isin(ids)]
+        day = t["날짜"].str[8:10].astype(int)
+        t, day = t[day.isin(days)], day[day.isin(days)]
+        if not t.empty:
+            net = t["실근로분"].fillna(0).round().astype(int)
+            hm = (net // 60).astype(str) + ":" + (net % 60).astype(str).str.zfill(2)
+            text = hm.where(t["상태"].isin(WARN_STATUSES + ("정상",)), t["상태"])
+            text = text.where(~t["경고"], "🚨 " + text)
+            cells = pd.DataFrame({"u": t["아이디"], "c": [day_column(year, month, d) for d in day], "v": text})
+            grid = cells.pivot(index="u", columns="c", values="v").reindex(index=ids, columns=cols).fillna("").rename_axis(columns=None)
+    grid.insert(0, "이름", staffs['이름'].astype(str).tolist())
+    return grid.reset_index(drop=True)
+
+
+def grid_style(grid):
+    # 칸 상태별 배경색 (경고 = 빨강, 정상 = 연두, 누락/오류 = 회색, 근무중 = 없음)
+    def css(v):
+        if v.startswith("🚨"): return GRID_COLORS["warn"]
+        if v in ("누락", "오류"): return GRID_COLORS["miss"]
+        if v == "근무중": return ""
+        return GRID_COLORS["ok"] if v else ""
+    return grid.style.map(css, subset=grid.columns[1:])